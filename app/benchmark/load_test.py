@@ -0,0 +1,242 @@
+""" /stocks endpoint load test
+
+Drives the application with concurrent requests, either in-process
+(flask test client) or over localhost (a local threaded server), with
+the browser scrapes replaced by a stubbed backend. Requests are split
+between hot regions (pre-warmed, expected cache hits) and never seen
+regions (expected cache misses). Latency percentiles are reported per
+observed cache outcome: like request profiling, each request is tagged
+with its region cache lookup right before it is sent (so a hot region
+expiring during the run counts as a miss).
+
+Usage:
+    python -m app.benchmark.load_test --requests 2000 --concurrency 32 \
+        --hit-ratio 0.9 --scrape-latency 0.5 --output load_test.json
+"""
+import json
+import time
+import random
+import argparse
+import threading
+import itertools
+from unittest import mock
+from string import ascii_lowercase
+from contextlib import contextmanager
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import make_server
+
+from app.main import create_app
+from app.main.util.regions import regions_catalog
+from app.main.service import stocks_service
+
+
+class StubScrapeBackend:
+    """
+    Replaces the browser scrapes: each scrape sleeps the informed
+    latency and records synthetic pages on the scrape checkpoint
+    """
+
+    def __init__(self, latency, stocks_per_region, page_size=100):
+        self.latency = latency
+        self.stocks_per_region = stocks_per_region
+        self.page_size = page_size
+        self.scrapes_count = itertools.count()
+
+    @contextmanager
+    def session(self):
+        yield None
+
+    def scrape(self, scrapper, region_name, checkpoint):
+        next(self.scrapes_count)
+        time.sleep(self.latency)
+
+        total = self.stocks_per_region
+        for first in range(1, total + 1, self.page_size):
+            last = min(first + self.page_size - 1, total)
+            checkpoint.save_page(first, last, total, [
+                {
+                    "name": f"{region_name} company {index}",
+                    "symbol": f"{region_name[:3].upper()}{index}",
+                    "price": f"{random.uniform(1, 5000):,.2f}"
+                }
+                for index in range(first, last + 1)
+            ])
+
+        return checkpoint.records()
+
+    @contextmanager
+    def installed(self):
+        with mock.patch.object(stocks_service, "supervisor", self), \
+                mock.patch.object(
+                    stocks_service, "scrape_region_stocks", self.scrape):
+            yield self
+
+
+def unseen_region_names():
+    """
+    Generates region names never requested before (cache misses)
+    """
+    for index in itertools.count():
+        suffix = ""
+        while True:
+            index, letter = divmod(index, len(ascii_lowercase))
+            suffix += ascii_lowercase[letter]
+            if index == 0:
+                break
+
+        yield f"Loadtest {suffix}"
+
+
+def percentile(sorted_values, rank):
+    """
+    Nearest-rank percentile of already sorted values
+    """
+    if not sorted_values:
+        return None
+
+    position = max(0, int(round(rank / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(position, len(sorted_values) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Throughput and latency percentiles (in milliseconds) of the samples
+    """
+    latencies = sorted(latency * 1000 for _, latency, _ in samples)
+    statuses = dict()
+    for _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "requests": len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else None,
+        "statuses": statuses
+    }
+
+
+@contextmanager
+def request_sender(flask_app, mode):
+    """
+    Yields a function sending one '/stocks' request (returning its status),
+    either through the flask test client or a local threaded server
+    """
+    if mode == "inprocess":
+        clients = threading.local()
+
+        def send(region_name):
+            if not hasattr(clients, "client"):
+                clients.client = flask_app.test_client()
+            return clients.client.get(
+                "/stocks", query_string={"region": region_name}).status_code
+
+        yield send
+        return
+
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_port}/stocks?"
+
+    def send(region_name):
+        try:
+            with urlopen(base_url + urlencode({"region": region_name})) as rsp:
+                rsp.read()
+                return rsp.status
+        except HTTPError as http_error:
+            return http_error.code
+
+    try:
+        yield send
+    finally:
+        server.shutdown()
+
+
+def run(arguments):
+    flask_app = create_app()
+    backend = StubScrapeBackend(
+        arguments.scrape_latency, arguments.stocks_per_region)
+    hot_regions = arguments.regions or regions_catalog[:5]
+    unseen_regions = unseen_region_names()
+
+    # Request plan: expected cache hits (hot) and misses (unseen)
+    randomizer = random.Random(arguments.seed)
+    plan = [
+        ("hit", randomizer.choice(hot_regions))
+        if randomizer.random() < arguments.hit_ratio
+        else ("miss", next(unseen_regions))
+        for _ in range(arguments.requests)
+    ]
+
+    with backend.installed(), request_sender(flask_app, arguments.mode) as send:
+        for region_name in hot_regions:
+            send(region_name)
+
+        def execute(planned):
+            _, region_name = planned
+            with flask_app.app_context():
+                cached = stocks_service.cached_region_stocks(region_name)
+
+            start = time.perf_counter()
+            status = send(region_name)
+            return (
+                "miss" if cached is None else "hit",
+                time.perf_counter() - start,
+                status
+            )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=arguments.concurrency) as pool:
+            samples = list(pool.map(execute, plan))
+        elapsed = time.perf_counter() - start
+
+    results = {
+        "configuration": vars(arguments),
+        "elapsed_s": elapsed,
+        "scrapes": next(backend.scrapes_count),
+        "overall": summarize(samples, elapsed),
+        "cache_hit": summarize(
+            [sample for sample in samples if sample[0] == "hit"], elapsed),
+        "cache_miss": summarize(
+            [sample for sample in samples if sample[0] == "miss"], elapsed)
+    }
+
+    print(json.dumps(results, indent=4))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(results, output, indent=4)
+
+    return results
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="/stocks load test")
+    parser.add_argument(
+        "--mode", default="inprocess", choices=["inprocess", "localhost"])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--regions", nargs="+", default=[], help="Hot regions (cache hits)")
+    parser.add_argument(
+        "--hit-ratio", type=float, default=0.8,
+        help="Share of requests targeting hot regions")
+    parser.add_argument(
+        "--scrape-latency", type=float, default=0.2,
+        help="Seconds taken by each stubbed scrape")
+    parser.add_argument("--stocks-per-region", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON results file")
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    run(parse_arguments())
@@ -0,0 +1,80 @@
+""" Stocks normalization benchmark
+
+Compares the previous per-record formatting against the vectorized
+normalization over synthetic regions of increasing size
+(text prices can only be handled by the vectorized normalization).
+
+Usage:
+    python -m app.benchmark.normalization [rows ...]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.main.util.data_manipulation import format_stock, normalize_stocks
+
+
+def generate_region(rows, seed=0):
+    """
+    Generates a raw stocks table shaped like the scrapped one
+    (numeric prices only, as the per-record formatting requires it)
+    """
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame({
+        "name": [f"Company {index}" for index in range(rows)],
+        "symbol": [f"SYM{index}.X" for index in range(rows)],
+        "price": rng.uniform(0.01, 5000, rows).round(4)
+    })
+
+
+def as_text_prices(stocks_frame):
+    """
+    Same table, with prices informed as Yahoo texts ("1,234.56")
+    """
+    return stocks_frame.assign(
+        price=stocks_frame["price"].map("{:,.2f}".format))
+
+
+def per_record_formatting(stocks_frame):
+    """
+    Per-record formatting, as done before the vectorized normalization
+    """
+    return {
+        stock['symbol']: format_stock(stock)
+        for stock in stocks_frame.fillna("").to_dict("records")
+    }
+
+
+def measure(function, stocks_frame, repeat=5):
+    """
+    Returns the best elapsed time (in seconds) among the repetitions
+    """
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(stocks_frame)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def run(sizes):
+    print(" | ".join([
+        f"{'rows':>10}", f"{'per-record (s)':>15}",
+        f"{'vectorized (s)':>15}", f"{'vectorized text (s)':>20}"
+    ]))
+    for rows in sizes:
+        stocks_frame = generate_region(rows)
+        print(" | ".join([
+            f"{rows:>10}",
+            f"{measure(per_record_formatting, stocks_frame):>15.4f}",
+            f"{measure(normalize_stocks, stocks_frame):>15.4f}",
+            f"{measure(normalize_stocks, as_text_prices(stocks_frame)):>20.4f}"
+        ]))
+
+
+if __name__ == '__main__':
+    run([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,57 @@
+""" Application startup benchmark
+
+Measures, on fresh interpreters, the time and memory taken to import
+the application and run its factory, and reports which heavy modules
+got loaded along the way (none of them should, unless preloaded).
+
+Usage:
+    python -m app.benchmark.startup [runs]
+"""
+import sys
+import json
+import statistics
+import subprocess
+
+STARTUP_SNIPPET = """
+import sys, json, time, resource
+start = time.perf_counter()
+
+from app.main import create_app, HEAVY_MODULES, preload_heavy_modules
+create_app()
+if {preload}:
+    preload_heavy_modules()
+
+print(json.dumps({{
+    "elapsed": time.perf_counter() - start,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules]
+}}))
+"""
+
+
+def measure_startup(preload=False):
+    """
+    Starts the application on a fresh interpreter, returning its metrics
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET.format(preload=preload)],
+        check=True, capture_output=True, text=True
+    )
+
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def run(runs):
+    for preload in (False, True):
+        samples = [measure_startup(preload) for _ in range(runs)]
+
+        print(" | ".join([
+            f"{'preloaded' if preload else 'lazy':>9}",
+            f"median startup: {statistics.median(s['elapsed'] for s in samples):.3f}s",
+            f"max rss: {max(s['max_rss_kb'] for s in samples) / 1024:.1f}MB",
+            f"heavy modules: {', '.join(samples[-1]['heavy_modules']) or '-'}"
+        ]))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
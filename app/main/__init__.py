@@ -1,18 +1,58 @@
+import importlib
+
 from flask import Flask
 from flask_restful import Api
 from decouple import config as env
 
-from app.main.config import config_by_name, cache
-from app.main.controller.stocks import StocksController
+from app.main.config import (
+    config_by_name, cache, validation_cache, checkpoint_cache, logger
+)
+from app.main.model.profiler import RequestProfiler
+from app.main.controller.stats import StatsController
+from app.main.controller.stream import StocksStreamController
+from app.main.controller.stocks import (
+    StocksController, describe_stocks_request
+)
+
+# Dependencies imported on first use, kept out of the application startup
+HEAVY_MODULES = (
+    "numpy", "pandas", "bs4",
+    "selenium.webdriver", "webdriver_manager.chrome"
+)
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(config_by_name[env('YAHOO_STOCKS_API_ENV')])
 
-    cache.init_app(app)
+    # Fail fast on a bad log file path, instead of on the first request
+    logger.configure()
+
+    # Each cache is an isolated namespace, with its own byte budget
+    cache.init_app(app, config={"CACHE_NAMESPACE": "regions"})
+    validation_cache.init_app(app, config={"CACHE_NAMESPACE": "validation"})
+    checkpoint_cache.init_app(app, config={"CACHE_NAMESPACE": "checkpoints"})
 
     api = Api(app)
     api.add_resource(StocksController, "/stocks")
+    api.add_resource(StocksStreamController, "/stocks/stream")
+    api.add_resource(StatsController, "/stats")
+
+    # Profiling hooks are only installed when enabled
+    RequestProfiler(
+        app.config["PROFILER_DIR"],
+        logger,
+        admin_token=app.config["PROFILER_ADMIN_TOKEN"],
+        sample_rate=app.config["PROFILER_SAMPLE_RATE"]
+    ).install(app, describe_stocks_request)
 
     return app
+
+
+def preload_heavy_modules():
+    """
+    Imports the heavy dependencies ahead of their first use,
+    so workers forked from a preloaded application share them
+    """
+    for module_name in HEAVY_MODULES:
+        importlib.import_module(module_name)
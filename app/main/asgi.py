@@ -0,0 +1,300 @@
+""" Asynchronous (ASGI) serving mode
+
+Cache hits are answered straight from the event loop, while scrapes run
+on a dedicated executor. Concurrent requests for the same region share
+a single scrape, so thousands of waiting clients only need as many
+OS threads as there are scrapes in flight. Stocks streams are relayed
+from the region feeds, without holding any thread per client.
+"""
+import json
+import asyncio
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from app.main import create_app
+from app.main.config import Config, logger
+from app.main.model.feed import format_event
+from app.main.model.cluster import FORWARDED_HEADER
+from app.main.controller.stocks import (
+    build_stocks_response, queue_full_response
+)
+from app.main.util.exceptions import ScrapeQueueFullError
+from app.main.util.data_validation import validate_region_name
+from app.main.service.stocks_service import (
+    admission, cached_region_stocks, follow_region
+)
+
+
+class AsyncStocksApp:
+    """
+    ASGI application serving the stocks API
+
+    Attributes:
+        flask_app (flask.Flask): The wrapped flask application
+
+        max_workers (int): Maximum number of scrapes running or waiting
+            for admission (simultaneous scrapes are limited by admission)
+    """
+
+    def __init__(self, flask_app, max_workers=(
+            Config.SCRAPPER_MAX_CONCURRENT + Config.SCRAPPER_QUEUE_SIZE)):
+        """
+        ASGI application class constructor
+
+        Arguments:
+            flask_app (flask.Flask): The wrapped flask application
+
+            max_workers (int): Optional maximum of running or waiting scrapes
+        """
+        self.flask_app = flask_app
+        self.max_workers = max_workers
+
+        # Executors are created on first use (fork safety)
+        self.__scrape_executor = None
+        self.__wsgi_executor = None
+
+        # Scrapes in flight, by region
+        self.__pending_scrapes = dict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.__handle_lifespan(receive, send)
+
+        elif scope["type"] == "http":
+            if scope["path"] == "/stocks" and scope["method"] == "GET":
+                await self.__handle_stocks(scope, send)
+            elif scope["path"] == "/stocks/stream" and scope["method"] == "GET":
+                await self.__handle_stream(scope, receive, send)
+            else:
+                await self.__handle_wsgi(scope, receive, send)
+
+    async def __handle_lifespan(self, receive, send):
+        """
+        Handles server startup and shutdown events
+        """
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                for executor in (self.__scrape_executor, self.__wsgi_executor):
+                    if executor is not None:
+                        executor.shutdown(wait=False)
+
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __handle_stocks(self, scope, send):
+        """
+        Answers '/stocks' requests. Validation and cache lookup run
+        on the event loop, scrapes are delegated to the executor
+        """
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+
+        with self.flask_app.app_context():
+            valid_region, region, error_message = validate_region_name(
+                query.get("region", [None])[0]
+            )
+            if not valid_region:
+                return await self.__send_json(send, 400, {
+                    "error": error_message, "region_informed": region
+                })
+
+            stocks = cached_region_stocks(region)
+
+        if stocks is not None:
+            return await self.__send_json(send, 200, stocks)
+
+        forwarded = FORWARDED_HEADER.lower().encode("latin-1") in dict(
+            scope["headers"])
+        try:
+            body, status, headers = await self.__scrape(region, forwarded)
+        except ScrapeQueueFullError as queue_ex:
+            body, status, headers = queue_full_response(queue_ex)
+        await self.__send_json(send, status, body, headers)
+
+    async def __handle_stream(self, scope, receive, send):
+        """
+        Answers '/stocks/stream' requests, relaying the region feed
+        events as Server-Sent Events until the client disconnects
+        """
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+
+        with self.flask_app.app_context():
+            valid_region, region, error_message = validate_region_name(
+                query.get("region", [None])[0]
+            )
+        if not valid_region:
+            return await self.__send_json(send, 400, {
+                "error": error_message, "region_informed": region
+            })
+
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def deliver(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        feed = follow_region(self.flask_app, region, deliver)
+        disconnection = asyncio.ensure_future(self.__wait_disconnection(receive))
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no")
+                ]
+            })
+
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnection},
+                    timeout=Config.FEED_HEARTBEAT_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if disconnection in done:
+                    next_event.cancel()
+                    return
+
+                if next_event not in done:
+                    next_event.cancel()
+                    chunk = ": keep-alive\n\n"
+                elif next_event.result() is None:
+                    break
+                else:
+                    chunk = format_event(*next_event.result())
+
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk.encode("utf-8"),
+                    "more_body": True
+                })
+
+            await send({"type": "http.response.body", "body": b""})
+
+        finally:
+            feed.unsubscribe(deliver)
+            disconnection.cancel()
+
+    @staticmethod
+    async def __wait_disconnection(receive):
+        """
+        Waits until the client disconnects
+        """
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def __scrape(self, region, forwarded=False):
+        """
+        Runs (or joins the one in flight) region scrape on the executor.
+        Raises ScrapeQueueFullError when every executor thread is taken,
+        instead of queueing the scrape out of the admission control
+        """
+        scrape_key = region.lower(), forwarded
+
+        if scrape_key not in self.__pending_scrapes:
+            if len(self.__pending_scrapes) >= self.max_workers:
+                logger.error(f"Scrape of {region} rejected: executor full")
+                raise admission.reject()
+
+            if self.__scrape_executor is None:
+                self.__scrape_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="scrapper"
+                )
+
+            logger.info(f"Scheduling {region} scrape")
+            scrape = asyncio.get_running_loop().run_in_executor(
+                self.__scrape_executor, self.__scrape_in_context,
+                region, forwarded)
+            scrape.add_done_callback(
+                lambda _: self.__pending_scrapes.pop(scrape_key, None))
+
+            self.__pending_scrapes[scrape_key] = scrape
+
+        return await asyncio.shield(self.__pending_scrapes[scrape_key])
+
+    def __scrape_in_context(self, region, forwarded):
+        """
+        Scrapes the region inside the flask application context
+        """
+        with self.flask_app.app_context():
+            return build_stocks_response(region, forwarded)
+
+    async def __handle_wsgi(self, scope, receive, send):
+        """
+        Delegates any other request to the flask (WSGI) application
+        """
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        environ = EnvironBuilder(
+            path=scope["path"],
+            method=scope["method"],
+            query_string=scope["query_string"],
+            headers=[
+                (name.decode("latin-1"), value.decode("latin-1"))
+                for name, value in scope["headers"]
+            ],
+            data=body
+        ).get_environ()
+
+        if self.__wsgi_executor is None:
+            self.__wsgi_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="wsgi")
+
+        app_iter, status, headers = await asyncio.get_running_loop(
+        ).run_in_executor(
+            self.__wsgi_executor,
+            lambda: run_wsgi_app(self.flask_app, environ, buffered=True)
+        )
+
+        await send({
+            "type": "http.response.start",
+            "status": int(status.split(" ")[0]),
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers.items()
+            ]
+        })
+        await send({"type": "http.response.body", "body": b"".join(app_iter)})
+
+    @staticmethod
+    async def __send_json(send, status, body, headers=None):
+        """
+        Sends a complete JSON response
+        """
+        payload = json.dumps(body).encode("utf-8") + b"\n"
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("latin-1"))
+            ] + [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in (headers or {}).items()
+            ]
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+def create_asgi_app():
+    """
+    Creates the ASGI application, wrapping a new flask application
+    """
+    return AsyncStocksApp(create_app())
@@ -1,4 +1,4 @@
-from decouple import config
+from decouple import config, Csv
 from flask_caching import Cache
 
 from app.main.model.log import ApiLogger
@@ -7,7 +7,43 @@ from app.main.model.log import ApiLogger
 class Config:
     DEBUG = False
     CACHE_TIMEOUT = config("CACHE_DEFAULT_TIMEOUT", cast=int)  # 3 minutes and 13 seconds caching
-    CACHE_TYPE = "SimpleCache"
+    CACHE_TYPE = "app.main.model.cache.BoundedMemoryCache"
+    CACHE_EVICTION_POLICY = config("CACHE_EVICTION_POLICY", default="lru")
+    CACHE_NAMESPACE_BUDGETS = dict(  # Resident bytes, by cache namespace
+        regions=config("CACHE_REGIONS_BUDGET_MB", default=64, cast=int) * 1024 ** 2,
+        validation=config("CACHE_VALIDATION_BUDGET_MB", default=1, cast=int) * 1024 ** 2,
+        checkpoints=config("CACHE_CHECKPOINTS_BUDGET_MB", default=32, cast=int) * 1024 ** 2
+    )
+    CHECKPOINT_TIMEOUT = config(
+        "SCRAPPER_CHECKPOINT_TIMEOUT", default=1800, cast=int)  # 30 minutes
+    SCRAPPER_MAX_WORKERS = config("SCRAPPER_MAX_WORKERS", default=4, cast=int)
+    SCRAPPER_MAX_CONCURRENT = config(
+        "SCRAPPER_MAX_CONCURRENT", default=SCRAPPER_MAX_WORKERS,
+        cast=int)  # By process (server workers do not share their browsers)
+    SCRAPPER_QUEUE_SIZE = config("SCRAPPER_QUEUE_SIZE", default=16, cast=int)
+    SCRAPPER_QUEUE_TIMEOUT = config(
+        "SCRAPPER_QUEUE_TIMEOUT", default=60, cast=int)  # Seconds
+    SCRAPPER_MAX_NAVIGATIONS = config(
+        "SCRAPPER_MAX_NAVIGATIONS", default=50, cast=int)
+    SCRAPPER_MAX_RSS_MB = config("SCRAPPER_MAX_RSS_MB", default=1024, cast=int)
+    SHORTCUTS_FILE_PATH = config(
+        "SCRAPPER_SHORTCUTS_FILE_PATH", default="./screener_shortcuts.json")
+    FEED_REFRESH_INTERVAL = config(
+        "FEED_REFRESH_INTERVAL", default=CACHE_TIMEOUT, cast=int)
+    FEED_HEARTBEAT_INTERVAL = config(
+        "FEED_HEARTBEAT_INTERVAL", default=15, cast=int)
+    FEED_MAX_STREAMS = config(
+        "FEED_MAX_STREAMS", default=8, cast=int)  # By WSGI process
+    CLUSTER_NODES = config("CLUSTER_NODES", default="", cast=Csv())
+    CLUSTER_SELF = config("CLUSTER_SELF", default="")
+    CLUSTER_TIMEOUT = config(
+        "CLUSTER_TIMEOUT", default=300, cast=int)  # Seconds (owner scrape)
+    CLUSTER_RETRY_INTERVAL = config(
+        "CLUSTER_RETRY_INTERVAL", default=30, cast=int)  # Seconds
+    PROFILER_ADMIN_TOKEN = config("PROFILER_ADMIN_TOKEN", default="")
+    PROFILER_SAMPLE_RATE = config(
+        "PROFILER_SAMPLE_RATE", default=0, cast=int)  # 1 in N requests
+    PROFILER_DIR = config("PROFILER_DIR", default="./profiles")
 
 
 class DevelopmentConfig(Config):
@@ -30,7 +66,9 @@ config_by_name = dict(
     prod=ProductionConfig
 )
 
-cache = Cache()
+cache = Cache()  # Region stocks
+validation_cache = Cache()  # Region names validations
+checkpoint_cache = Cache()  # Scrapping checkpoints
 logger = ApiLogger(
     logger_name=config("API_LOGGER_NAME"),
     record_log=config("API_LOGGER_RECORD_LOG", cast=bool),
@@ -0,0 +1,19 @@
+""" Stats controller class """
+from flask_restful import Resource
+
+from app.main.model.cache import cache_tier
+from app.main.service.stocks_service import (
+    supervisor, feed_hub, admission, cluster
+)
+
+
+class StatsController(Resource):
+
+    def get(self):
+        return {
+            "browsers": supervisor.stats(),
+            "admission": admission.stats(),
+            "feeds": feed_hub.followed_regions(),
+            "cache": cache_tier.stats(),
+            "cluster": cluster.stats()
+        }, 200
@@ -4,8 +4,13 @@ from flask_restful import Resource
 
 from app.main.config import logger
 from app.main.util.data_validation import validate_region_name
-from app.main.service.stocks_service import recover_region_stocks
-from app.main.util.exceptions import UserError, InternalError
+from app.main.model.cluster import FORWARDED_HEADER
+from app.main.service.stocks_service import (
+    recover_region_stocks, cached_region_stocks, cluster
+)
+from app.main.util.exceptions import (
+    UserError, InternalError, PartialScrapeError, ScrapeQueueFullError
+)
 
 
 class StocksController(Resource):
@@ -17,12 +22,58 @@ class StocksController(Resource):
         if not valid_region:
             return {"error": error_message, "region_informed": region}, 400
 
-        try:
-            return recover_region_stocks(region), 200
-        except UserError as usr_ex:
-            return {"error": str(usr_ex)}, 400
-        except InternalError:
-            return {"error": "API failed, please try again later"}, 500
-        except Exception:
-            logger.error("Unknown API error")
-            return {"error": "Internal server error"}, 500
+        return build_stocks_response(
+            region, forwarded=FORWARDED_HEADER in request.headers)
+
+
+def describe_stocks_request():
+    """
+    Tags the current '/stocks' request with its region
+    and cache outcome ('hit', 'miss' or 'invalid')
+    """
+    valid_region, region, _ = validate_region_name(request.args.get("region"))
+    if not valid_region:
+        return str(region), "invalid"
+
+    return region, "miss" if cached_region_stocks(region) is None else "hit"
+
+
+def build_stocks_response(region, forwarded=False):
+    """
+    Recovers the (already validated) region stocks, translating
+    known errors to API responses. On cluster mode, regions owned by
+    another instance are requested to it, unless already cached here
+    or the request was 'forwarded' by another instance.
+    Returns the response body, status and headers
+    """
+    owner = None if forwarded else cluster.owner(region)
+    if owner is not None and cached_region_stocks(region) is None:
+        response = cluster.forward(owner, region)
+        if response is not None:
+            return response
+
+    try:
+        return recover_region_stocks(region), 200, {}
+    except UserError as usr_ex:
+        return {"error": str(usr_ex)}, 400, {}
+    except PartialScrapeError as partial_ex:
+        return partial_ex.stocks, 206, {
+            "X-Stocks-Partial": "true",
+            "X-Stocks-Coverage": f"{partial_ex.recovered}/{partial_ex.total}"
+        }
+    except ScrapeQueueFullError as queue_ex:
+        return queue_full_response(queue_ex)
+    except InternalError:
+        return {"error": "API failed, please try again later"}, 500, {}
+    except Exception:
+        logger.error("Unknown API error")
+        return {"error": "Internal server error"}, 500, {}
+
+
+def queue_full_response(queue_ex):
+    """
+    Response of a scrape not admitted (ScrapeQueueFullError)
+    """
+    return {"error": "Too many scrapes in progress, retry later"}, 429, {
+        "Retry-After": str(queue_ex.retry_after)
+    }
@@ -0,0 +1,56 @@
+""" Stocks stream controller class """
+import threading
+from queue import Queue, Empty
+
+from flask import request, current_app, Response
+from flask_restful import Resource
+
+from app.main.config import Config
+from app.main.model.feed import format_event
+from app.main.util.data_validation import validate_region_name
+from app.main.service.stocks_service import follow_region
+
+# Each WSGI stream holds a server thread for the whole connection, so
+# only part of them may be streaming (the asynchronous mode has no limit)
+streams = threading.BoundedSemaphore(Config.FEED_MAX_STREAMS)
+
+
+class StocksStreamController(Resource):
+
+    def get(self):
+        valid_region, region, error_message = validate_region_name(
+            request.args.get("region")
+        )
+        if not valid_region:
+            return {"error": error_message, "region_informed": region}, 400
+
+        if not streams.acquire(blocking=False):
+            return {
+                "error": "Too many streams open, please retry later"
+            }, 503, {"Retry-After": str(Config.FEED_HEARTBEAT_INTERVAL)}
+
+        events = Queue()
+        feed = follow_region(
+            current_app._get_current_object(), region, events.put)
+
+        def stream():
+            while True:
+                try:
+                    event = events.get(timeout=Config.FEED_HEARTBEAT_INTERVAL)
+                except Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if event is None:
+                    break
+
+                yield format_event(*event)
+
+        response = Response(stream(), mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+        response.call_on_close(lambda: feed.unsubscribe(events.put))
+        response.call_on_close(streams.release)
+
+        return response
@@ -0,0 +1,173 @@
+""" Scrapes admission control module """
+import math
+import time
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+
+from app.main.util.exceptions import ScrapeQueueFullError
+
+HIGH_PRIORITY = 0  # Hot and pre-warm traffic (followed regions, exports)
+NORMAL_PRIORITY = 1  # Client requests
+
+
+class AdmissionController:
+    """
+    Limits the number of simultaneous scrapes (each one holds a browser)
+    of the process. Scrapes beyond the limit wait on a bounded priority
+    queue, and are rejected once the queue is full or after waiting too long
+
+    Attributes:
+        logger (stocks_api.log.ApiLogger): The application logger
+
+        max_concurrent (int): Maximum number of simultaneous scrapes
+
+        queue_size (int): Maximum number of waiting scrapes
+
+        max_wait (float): Maximum seconds waiting for admission
+    """
+
+    def __init__(self, logger, max_concurrent=4, queue_size=16, max_wait=60):
+        """
+        Admission controller class constructor
+
+        Arguments:
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            max_concurrent (int): Optional maximum of simultaneous scrapes
+
+            queue_size (int): Optional maximum of waiting scrapes
+
+            max_wait (float): Optional maximum seconds waiting for admission
+        """
+        self.logger = logger
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+
+        self.__condition = threading.Condition()
+        self.__waiting = list()  # Heap of (priority, arrival) tickets
+        self.__arrivals = itertools.count()
+        self.__running = 0
+        self.__local = threading.local()
+
+        self.__admitted = 0
+        self.__rejected = 0
+        self.__total_wait = 0.0
+        self.__average_duration = None
+
+    @contextmanager
+    def prioritized(self, priority=HIGH_PRIORITY):
+        """
+        Scrapes admitted by the current thread inside
+        this context get the informed priority
+        """
+        previous = getattr(self.__local, "priority", NORMAL_PRIORITY)
+        self.__local.priority = priority
+        try:
+            yield
+        finally:
+            self.__local.priority = previous
+
+    @contextmanager
+    def admit(self, bounded=True):
+        """
+        Waits for a scrape slot, holding it until the context exits.
+        Raises ScrapeQueueFullError when the scrape is not admitted.
+        Scrapes not 'bounded' (batch callers) wait without deadline
+        """
+        waited = self.__acquire(bounded)
+        start = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.__release(time.perf_counter() - start)
+
+    def reject(self):
+        """
+        Records a scrape rejected before reaching the admission queue
+        (e.g. no thread left to wait on it). Returns the error to raise
+        """
+        with self.__condition:
+            self.__rejected += 1
+            return ScrapeQueueFullError(self.__retry_after())
+
+    def __retry_after(self):
+        """
+        Estimated seconds until a new scrape could be admitted
+        """
+        duration = self.__average_duration or self.max_wait
+        rounds = (len(self.__waiting) + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(duration * rounds))
+
+    def __acquire(self, bounded):
+        priority = getattr(self.__local, "priority", NORMAL_PRIORITY)
+        arrival = time.perf_counter()
+
+        with self.__condition:
+            if not self.__waiting and self.__running < self.max_concurrent:
+                self.__running += 1
+                self.__admitted += 1
+                return 0.0
+
+            if len(self.__waiting) >= self.queue_size:
+                self.__rejected += 1
+                self.logger.error("Scrape rejected: admission queue full")
+                raise ScrapeQueueFullError(self.__retry_after())
+
+            ticket = (priority, next(self.__arrivals))
+            heapq.heappush(self.__waiting, ticket)
+
+            deadline = arrival + self.max_wait if bounded else None
+            while self.__waiting[0] != ticket or (
+                    self.__running >= self.max_concurrent):
+                remaining = None if deadline is None else (
+                    deadline - time.perf_counter())
+                if remaining is not None and remaining <= 0:
+                    self.__waiting.remove(ticket)
+                    heapq.heapify(self.__waiting)
+                    self.__condition.notify_all()
+
+                    self.__rejected += 1
+                    self.logger.error("Scrape rejected: admission wait expired")
+                    raise ScrapeQueueFullError(self.__retry_after())
+
+                self.__condition.wait(remaining)
+
+            heapq.heappop(self.__waiting)
+            self.__running += 1
+            self.__admitted += 1
+
+            waited = time.perf_counter() - arrival
+            self.__total_wait += waited
+            self.__condition.notify_all()
+
+            return waited
+
+    def __release(self, duration):
+        with self.__condition:
+            self.__running -= 1
+            self.__average_duration = duration if (
+                self.__average_duration is None
+            ) else 0.8 * self.__average_duration + 0.2 * duration
+            self.__condition.notify_all()
+
+    def stats(self):
+        """
+        Reports running and queued scrapes, and admission waits
+        """
+        with self.__condition:
+            return {
+                "running": self.__running,
+                "queued": len(self.__waiting),
+                "max_concurrent": self.max_concurrent,
+                "queue_size": self.queue_size,
+                "admitted": self.__admitted,
+                "rejected": self.__rejected,
+                "average_wait": (
+                    self.__total_wait / self.__admitted
+                    if self.__admitted else None
+                ),
+                "average_scrape_duration": self.__average_duration
+            }
@@ -0,0 +1,265 @@
+""" Memory-bounded cache tier module
+
+Every cached value is pickled, and its measured size is charged to the
+byte budget of its namespace. Namespaces (region stocks, validations,
+checkpoints ...) never compete for each other's budget.
+"""
+import time
+import pickle
+import threading
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+
+
+class CacheNamespace:
+    """
+    Byte-bounded store of one cache namespace
+
+    Attributes:
+        name (str): The namespace name
+
+        budget_bytes (int): Maximum resident bytes
+
+        policy (str): Eviction policy. 'lru' (least recently used) or
+            'cost' (GreedyDual-Size: small and recently used entries are
+            kept, large and stale ones are evicted first)
+    """
+
+    def __init__(self, name, budget_bytes, policy="lru"):
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.policy = policy
+
+        self.__lock = threading.RLock()
+        self.__entries = OrderedDict()  # key -> (expires, payload, size)
+        self.__priorities = dict()  # key -> GreedyDual-Size priority
+        self.__inflation = 0.0
+
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    @staticmethod
+    def __entry_size(key, payload):
+        return len(key) + len(payload)
+
+    def get(self, key, counted=True):
+        """
+        Returns the key value (None if missing or expired).
+        Lookups not 'counted' are left out of hits and misses
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += counted
+                return None
+
+            expires, payload, size = entry
+            if expires != 0 and expires <= time.time():
+                self.__remove(key)
+                self.expirations += 1
+                self.misses += counted
+                return None
+
+            self.hits += counted
+            self.__touch(key, size)
+
+        return pickle.loads(payload)
+
+    def has(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry is not None and (
+                entry[0] == 0 or entry[0] > time.time())
+
+    def set(self, key, value, timeout):
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        size = self.__entry_size(key, payload)
+        expires = 0 if timeout == 0 else time.time() + timeout
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+            if size > self.budget_bytes:
+                self.rejections += 1
+                return False
+
+            self.__make_room(size)
+
+            self.__entries[key] = (expires, payload, size)
+            self.resident_bytes += size
+            self.__touch(key, size)
+
+        return True
+
+    def delete(self, key):
+        with self.__lock:
+            if key not in self.__entries:
+                return False
+
+            self.__remove(key)
+            return True
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__priorities.clear()
+            self.resident_bytes = 0
+
+    def __touch(self, key, size):
+        """
+        Refreshes the entry recency (and GreedyDual-Size priority)
+        """
+        self.__entries.move_to_end(key)
+        if self.policy == "cost":
+            self.__priorities[key] = self.__inflation + 1 / size
+
+    def __remove(self, key):
+        expires, payload, size = self.__entries.pop(key)
+        self.__priorities.pop(key, None)
+        self.resident_bytes -= size
+
+    def __make_room(self, size):
+        """
+        Evicts entries until 'size' more bytes fit in the budget
+        (expired entries go first)
+        """
+        if self.resident_bytes + size <= self.budget_bytes:
+            return
+
+        now = time.time()
+        for key in [
+            key for key, (expires, _, _) in self.__entries.items()
+            if expires != 0 and expires <= now
+        ]:
+            self.__remove(key)
+            self.expirations += 1
+
+        while self.resident_bytes + size > self.budget_bytes:
+            if self.policy == "cost":
+                victim = min(self.__priorities, key=self.__priorities.get)
+                self.__inflation = self.__priorities[victim]
+            else:
+                victim = next(iter(self.__entries))
+
+            self.__remove(victim)
+            self.evictions += 1
+
+    def stats(self):
+        with self.__lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "policy": self.policy,
+                "entries": len(self.__entries),
+                "resident_bytes": self.resident_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejections": self.rejections
+            }
+
+
+class MemoryCacheTier:
+    """
+    Process-wide set of byte-bounded cache namespaces
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__namespaces = dict()
+
+    def namespace(self, name, budget_bytes, policy="lru"):
+        """
+        Returns the informed namespace, creating it if necessary
+        (an existing namespace gets the informed budget and policy)
+        """
+        with self.__lock:
+            namespace = self.__namespaces.get(name)
+            if namespace is None:
+                namespace = CacheNamespace(name, budget_bytes, policy)
+                self.__namespaces[name] = namespace
+            else:
+                namespace.budget_bytes = budget_bytes
+                namespace.policy = policy
+
+            return namespace
+
+    def stats(self):
+        """
+        Reports hits, misses, evictions and resident bytes per namespace
+        """
+        with self.__lock:
+            namespaces = list(self.__namespaces.values())
+
+        return {namespace.name: namespace.stats() for namespace in namespaces}
+
+
+cache_tier = MemoryCacheTier()
+
+
+class BoundedMemoryCache(BaseCache):
+    """
+    Flask-Caching backend storing its values on one namespace
+    of the memory cache tier.
+
+    Configuration:
+        CACHE_NAMESPACE (str): The namespace of the cache instance
+
+        CACHE_NAMESPACE_BUDGETS (dict): Byte budget by namespace
+
+        CACHE_EVICTION_POLICY (str): 'lru' or 'cost'
+    """
+
+    VERSION_KEY_SUFFIX = "_memver"
+
+    def __init__(self, namespace, default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        self.namespace = namespace
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        name = config.get("CACHE_NAMESPACE", "default")
+        budgets = config.get("CACHE_NAMESPACE_BUDGETS", {})
+
+        namespace = cache_tier.namespace(
+            name,
+            budgets.get(name, budgets.get("default", 16 * 1024 ** 2)),
+            config.get("CACHE_EVICTION_POLICY", "lru")
+        )
+
+        return cls(namespace, default_timeout=kwargs.get("default_timeout", 300))
+
+    def get(self, key):
+        # Memoized functions version lookups (one per call) are not
+        # cache hits or misses of the memoized values
+        return self.namespace.get(
+            key, counted=not key.endswith(self.VERSION_KEY_SUFFIX))
+
+    def set(self, key, value, timeout=None):
+        return self.namespace.set(
+            key, value, self._normalize_timeout(timeout))
+
+    def add(self, key, value, timeout=None):
+        if self.namespace.has(key):
+            return False
+
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        return self.namespace.delete(key)
+
+    def has(self, key):
+        return self.namespace.has(key)
+
+    def clear(self):
+        self.namespace.clear()
+        return True
@@ -0,0 +1,163 @@
+""" Scrapping checkpoints module """
+import threading
+from uuid import uuid4
+
+from app.main.config import checkpoint_cache, Config
+
+
+class ScrapeCheckpoint:
+    """
+    Per-page scrapping checkpoint, stored on the checkpoints cache
+
+    Attributes:
+        region_name (str): The region being scrapped
+
+        session_id (str): Identifier of the scrape session being recorded
+
+        pages (dict): Recovered pages, indexed by their zero based offset.
+            Each page holds its 'end' offset and its 'records'
+
+        total (int): Total of records announced by the results table
+    """
+
+    __save_lock = threading.Lock()
+
+    def __init__(self, region_name, session_id, store=checkpoint_cache,
+                 timeout=Config.CHECKPOINT_TIMEOUT):
+        """
+        Scrapping checkpoint class constructor
+
+        Arguments:
+            region_name (str): The region being scrapped
+
+            session_id (str): Identifier of the scrape session
+
+            store (flask_caching.Cache): Optional key/value store
+                (anything implementing get/set/delete). Default: checkpoints cache
+
+            timeout (int): Optional checkpoint lifetime, in seconds
+        """
+        self.region_name = region_name
+        self.session_id = session_id
+        self.__store = store
+        self.__timeout = timeout
+
+        # Previously recorded state recovery (if existent)
+        state = self.__store.get(self.__state_key()) or {}
+        self.pages = state.get("pages", {})
+        self.total = state.get("total")
+
+    @classmethod
+    def open(cls, region_name, store=checkpoint_cache, timeout=Config.CHECKPOINT_TIMEOUT):
+        """
+        Resumes the unfinished scrape session of the region (if existent),
+        otherwise starts a new one
+
+        Arguments:
+            region_name (str): The region being scrapped
+
+            store (flask_caching.Cache): Optional key/value store
+
+            timeout (int): Optional checkpoint lifetime, in seconds
+        """
+        session_key = cls.__session_key(region_name)
+
+        session_id = store.get(session_key)
+        if session_id is None:
+            session_id = uuid4().hex
+            store.set(session_key, session_id, timeout=timeout)
+
+        return cls(region_name, session_id, store=store, timeout=timeout)
+
+    @staticmethod
+    def __session_key(region_name):
+        """
+        Cache key of the region's current scrape session
+        """
+        return f"scrape_session::{region_name.lower()}"
+
+    def __state_key(self):
+        """
+        Cache key of the checkpoint state
+        """
+        return "::".join([
+            "scrape_checkpoint", self.region_name.lower(), self.session_id
+        ])
+
+    def save_page(self, first, last, total, records):
+        """
+        Records a recovered page and persists the checkpoint
+
+        Arguments:
+            first (int): One based index of the first page record
+
+            last (int): One based index of the last page record
+
+            total (int): Total of records announced by the results table
+
+            records (list): Page records
+        """
+        # Concurrent scrapes of the region share the session: the stored
+        # pages are merged, so no scrape overwrites the others progress
+        with self.__save_lock:
+            state = self.__store.get(self.__state_key()) or {}
+            self.pages = {**state.get("pages", {}), **self.pages}
+            self.pages[first - 1] = {"end": last, "records": records}
+            self.total = total
+
+            self.__store.set(
+                self.__state_key(),
+                {"pages": self.pages, "total": self.total},
+                timeout=self.__timeout
+            )
+
+    def has_page(self, first):
+        """
+        Checks if the page starting at the one based 'first' index
+        was already recovered
+        """
+        return (first - 1) in self.pages
+
+    @property
+    def next_offset(self):
+        """
+        First zero based offset not covered by the recovered pages
+        """
+        offset = 0
+        while offset in self.pages:
+            offset = self.pages[offset]["end"]
+
+        return offset
+
+    def coverage(self):
+        """
+        Returns the number of recovered records and the expected total
+        """
+        recovered = sum(
+            page["end"] - offset for offset, page in self.pages.items()
+        )
+
+        return recovered, self.total
+
+    def is_complete(self):
+        """
+        Checks if every announced record was recovered
+        """
+        return self.total is not None and self.next_offset >= self.total
+
+    def records(self):
+        """
+        Returns all recovered records, merged in offset order
+        """
+        return [
+            record
+            for offset in sorted(self.pages)
+            for record in self.pages[offset]["records"]
+        ]
+
+    def close(self):
+        """
+        Finishes the scrape session, discarding its checkpoint
+        """
+        self.__store.delete(self.__state_key())
+        self.__store.delete(self.__session_key(self.region_name))
@@ -0,0 +1,195 @@
+""" Cluster sharding module
+
+Every region is owned by one API instance, chosen by consistent hashing,
+so each region is scrapped and cached by a single instance of the cluster.
+"""
+import time
+import bisect
+import hashlib
+import threading
+
+FORWARDED_HEADER = "X-Stocks-Forwarded"
+
+# Owner responses relayed as they are (anything else triggers failover)
+RELAYED_STATUSES = (200, 206, 400, 429, 500)
+RELAYED_HEADERS = ("X-Stocks-Partial", "X-Stocks-Coverage", "Retry-After")
+
+
+class HashRing:
+    """
+    Consistent hashing ring. Each node is placed on the ring many times
+    (virtual nodes), so keys spread evenly, and adding or removing
+    a node only moves the keys of that node
+
+    Attributes:
+        nodes (list): The ring nodes
+    """
+
+    def __init__(self, nodes, replicas=100):
+        """
+        Hash ring class constructor
+
+        Arguments:
+            nodes (list): The ring nodes
+
+            replicas (int): Optional number of virtual nodes per node
+        """
+        self.nodes = list(nodes)
+        self.__points = sorted(
+            (self.__hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self.__hashes = [point_hash for point_hash, _ in self.__points]
+
+    @staticmethod
+    def __hash(key):
+        return int(hashlib.md5(key.encode("utf-8")).hexdigest()[:16], 16)
+
+    def owner(self, key, excluded=()):
+        """
+        Returns the node owning the key: the first one found clockwise,
+        skipping excluded nodes (None if every node is excluded)
+        """
+        if not self.__points:
+            return None
+
+        start = bisect.bisect(self.__hashes, self.__hash(key))
+        for index in range(len(self.__points)):
+            node = self.__points[(start + index) % len(self.__points)][1]
+            if node not in excluded:
+                return node
+
+        return None
+
+
+class ClusterRouter:
+    """
+    Forwards region requests to their owner instance, through pooled
+    HTTP connections. Owners found down are skipped for a while,
+    and their regions served locally
+
+    Attributes:
+        logger (stocks_api.log.ApiLogger): The application logger
+
+        self_node (str): This instance base url
+
+        enabled (bool): If the cluster mode is enabled
+    """
+
+    def __init__(self, logger, nodes, self_node, timeout=300,
+                 retry_interval=30, replicas=100):
+        """
+        Cluster router class constructor
+
+        Arguments:
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            nodes (list): Base url of every cluster instance
+
+            self_node (str): This instance base url
+
+            timeout (int): Optional seconds waiting for an owner response
+
+            retry_interval (int): Optional seconds skipping a down owner
+
+            replicas (int): Optional number of virtual nodes per instance
+        """
+        self.logger = logger
+        self.self_node = self_node.rstrip("/")
+        self.enabled = len(nodes) > 1
+
+        self.__ring = HashRing([node.rstrip("/") for node in nodes], replicas)
+        self.__timeout = timeout
+        self.__retry_interval = retry_interval
+
+        self.__lock = threading.Lock()
+        self.__session = None  # Created on first use (fork safety)
+        self.__down_until = dict()
+        self.__forwarded = 0
+        self.__failovers = 0
+
+    def owner(self, region_name):
+        """
+        Returns the owner base url of the region,
+        or None when the region is served by this instance
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self.__lock:
+            down_nodes = {
+                node for node, until in self.__down_until.items()
+                if until > now and node != self.self_node
+            }
+
+        node = self.__ring.owner(region_name.lower(), excluded=down_nodes)
+        return None if node in (None, self.self_node) else node
+
+    def forward(self, node, region_name):
+        """
+        Requests the region stocks to its owner.
+        Returns the response body, status and headers,
+        or None when the owner could not answer
+        """
+        import requests
+
+        try:
+            response = self.__get_session().get(
+                f"{node}/stocks",
+                params={"region": region_name},
+                headers={FORWARDED_HEADER: self.self_node},
+                timeout=(2, self.__timeout)
+            )
+            if response.status_code not in RELAYED_STATUSES:
+                raise requests.HTTPError(f"Status {response.status_code}")
+
+            body = response.json()
+
+        except (requests.RequestException, ValueError) as ex:
+            self.logger.error(f"Owner {node} failed, serving locally: {ex}")
+            with self.__lock:
+                self.__down_until[node] = time.time() + self.__retry_interval
+                self.__failovers += 1
+            return None
+
+        with self.__lock:
+            self.__down_until.pop(node, None)
+            self.__forwarded += 1
+
+        return body, response.status_code, {
+            name: response.headers[name]
+            for name in RELAYED_HEADERS if name in response.headers
+        }
+
+    def __get_session(self):
+        import requests
+
+        with self.__lock:
+            if self.__session is None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=len(self.__ring.nodes), pool_maxsize=32)
+                self.__session = requests.Session()
+                self.__session.mount("http://", adapter)
+                self.__session.mount("https://", adapter)
+
+            return self.__session
+
+    def stats(self):
+        """
+        Reports the cluster nodes, the ones found down,
+        and the forwarded and failed over requests
+        """
+        now = time.time()
+        with self.__lock:
+            return {
+                "self": self.self_node,
+                "nodes": self.__ring.nodes,
+                "down": [
+                    node for node, until in self.__down_until.items()
+                    if until > now
+                ],
+                "forwarded": self.__forwarded,
+                "failovers": self.__failovers
+            }
@@ -0,0 +1,138 @@
+""" Region stocks export writers """
+import csv
+import json
+
+from app.main.util.data_manipulation import normalize_stocks
+
+
+class StocksWriter:
+    """
+    Base stocks file writer. Pages are normalized and written as soon
+    as they arrive, so only one page is kept in memory at a time
+
+    Attributes:
+        path (pathlib.Path): The output file path
+
+        region_name (str): The exported region
+
+        rows_count (int): Number of stocks written
+    """
+    extension = None
+    columns = ["region", "symbol", "name", "price"]
+
+    def __init__(self, path, region_name):
+        """
+        Stocks writer class constructor
+
+        Arguments:
+            path (pathlib.Path): The output file path
+
+            region_name (str): The exported region
+        """
+        self.path = path
+        self.region_name = region_name
+        self.rows_count = 0
+        self.__written_symbols = set()
+
+    def write_page(self, records):
+        """
+        Normalizes the raw page records and writes the stocks
+        not yet written (symbols repeated across pages are skipped)
+        """
+        import pandas as pd
+
+        stocks = normalize_stocks(pd.DataFrame.from_records(
+            records, columns=["name", "symbol", "price"]))
+
+        self.write_stocks([
+            dict(region=self.region_name, **stock)
+            for symbol, stock in stocks.items()
+            if symbol not in self.__written_symbols
+        ])
+        self.__written_symbols.update(stocks)
+
+    def write_stocks(self, rows):
+        """
+        Writes already normalized stocks
+        """
+        if rows:
+            self._write_rows(rows)
+            self.rows_count += len(rows)
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class NdjsonStocksWriter(StocksWriter):
+    """
+    Newline delimited JSON writer (one stock per line)
+    """
+    extension = "ndjson"
+
+    def __init__(self, path, region_name):
+        super().__init__(path, region_name)
+        self.__file = open(path, "w", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        self.__file.writelines(json.dumps(row) + "\n" for row in rows)
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class CsvStocksWriter(StocksWriter):
+    """
+    Comma separated values writer (with header)
+    """
+    extension = "csv"
+
+    def __init__(self, path, region_name):
+        super().__init__(path, region_name)
+        self.__file = open(path, "w", encoding="utf-8", newline="")
+        self.__writer = csv.DictWriter(self.__file, fieldnames=self.columns)
+        self.__writer.writeheader()
+
+    def _write_rows(self, rows):
+        self.__writer.writerows(rows)
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+class ParquetStocksWriter(StocksWriter):
+    """
+    Parquet writer (one row group per page). Requires pyarrow
+    """
+    extension = "parquet"
+
+    def __init__(self, path, region_name):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, region_name)
+        self.__schema = pa.schema(
+            [(column, pa.string()) for column in self.columns])
+        self.__writer = pq.ParquetWriter(str(path), self.__schema)
+
+    def _write_rows(self, rows):
+        import pyarrow as pa
+
+        self.__writer.write_table(pa.Table.from_pydict(
+            {column: [row[column] for row in rows] for column in self.columns},
+            schema=self.__schema
+        ))
+
+    def close(self):
+        self.__writer.close()
+
+
+writers_by_format = dict(
+    ndjson=NdjsonStocksWriter,
+    csv=CsvStocksWriter,
+    parquet=ParquetStocksWriter
+)
@@ -0,0 +1,204 @@
+""" Region price change feeds module """
+import json
+import threading
+
+from app.main.util.data_manipulation import diff_snapshots
+from app.main.util.exceptions import (
+    UserError, PartialScrapeError, ScrapeQueueFullError
+)
+
+
+def format_event(event, data):
+    """
+    Formats an event in the Server-Sent Events wire format
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class RegionFeed:
+    """
+    Periodically refreshes one region snapshot, fanning out its
+    changes to every subscriber. A single refresh serves them all
+
+    Attributes:
+        region_name (str): The followed region
+
+        snapshot (dict): Last region snapshot (None before the first one)
+    """
+
+    def __init__(self, region_name, load, refresh, interval, logger, on_close):
+        """
+        Region feed class constructor
+
+        Arguments:
+            region_name (str): The followed region
+
+            load (callable): Recovers the first snapshot (cache allowed)
+
+            refresh (callable): Recovers a fresh snapshot
+
+            interval (int): Seconds between refreshes
+
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            on_close (callable): Called once the feed is finished
+        """
+        self.region_name = region_name
+        self.snapshot = None
+        self.logger = logger
+
+        self.__load = load
+        self.__refresh = refresh
+        self.__interval = interval
+        self.__on_close = on_close
+
+        self.__lock = threading.Lock()
+        self.__subscribers = list()
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.__run, name=f"feed-{region_name}", daemon=True)
+
+    def start(self):
+        self.__thread.start()
+
+    def subscribe(self, deliver):
+        """
+        Adds a subscriber. 'deliver' receives (event, data) tuples,
+        starting with the current snapshot, or None when the feed ends.
+        Returns False if the feed is already finishing
+        """
+        with self.__lock:
+            if self.__stop.is_set():
+                return False
+
+            self.__subscribers.append(deliver)
+            if self.snapshot is not None:
+                deliver(("snapshot", self.snapshot))
+
+            return True
+
+    def unsubscribe(self, deliver):
+        """
+        Removes a subscriber. The feed stops with its last subscriber
+        """
+        with self.__lock:
+            if deliver in self.__subscribers:
+                self.__subscribers.remove(deliver)
+            if not self.__subscribers:
+                self.__stop.set()
+
+    def subscribers_count(self):
+        with self.__lock:
+            return len(self.__subscribers)
+
+    def __publish(self, event):
+        with self.__lock:
+            for deliver in self.__subscribers:
+                try:
+                    deliver(event)
+                except Exception as ex:
+                    self.logger.error(f"Feed delivery failed: {ex}")
+
+    def __run(self):
+        """
+        Refresh loop: publishes the first snapshot, then only changes
+        """
+        recover = self.__load
+
+        while not self.__stop.is_set():
+            try:
+                stocks = recover()
+            except (PartialScrapeError, ScrapeQueueFullError) as partial_ex:
+                self.logger.error(f"Feed {self.region_name}: {partial_ex}")
+                stocks = None
+            except UserError as usr_ex:
+                self.__publish(("error", {"error": str(usr_ex)}))
+                self.__stop.set()
+                break
+            except Exception as ex:
+                self.logger.error(f"Feed {self.region_name} failed: {ex}")
+                self.__publish(("error", {"error": "Feed refresh failed"}))
+                stocks = None
+
+            if stocks is not None:
+                with self.__lock:
+                    previous, self.snapshot = self.snapshot, stocks
+
+                if previous is None:
+                    self.__publish(("snapshot", stocks))
+                else:
+                    changes = diff_snapshots(previous, stocks)
+                    if any(changes.values()):
+                        self.__publish(("delta", changes))
+
+                recover = self.__refresh
+
+            self.__stop.wait(self.__interval)
+
+        self.__on_close(self)
+        self.__publish(None)
+
+
+class FeedHub:
+    """
+    Keeps one feed per followed region
+    """
+
+    def __init__(self, logger, interval):
+        """
+        Feed hub class constructor
+
+        Arguments:
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            interval (int): Seconds between region refreshes
+        """
+        self.logger = logger
+        self.__interval = interval
+        self.__lock = threading.Lock()
+        self.__feeds = dict()
+
+    def subscribe(self, region_name, deliver, load, refresh):
+        """
+        Subscribes to the region feed, starting it if necessary.
+        'load' and 'refresh' are used only when the feed is started
+        """
+        feed_key = region_name.lower()
+
+        with self.__lock:
+            feed = self.__feeds.get(feed_key)
+            if feed is None or not feed.subscribe(deliver):
+                self.logger.info(f"Starting {region_name} feed")
+                feed = RegionFeed(
+                    region_name, load, refresh, self.__interval,
+                    self.logger, self.__remove
+                )
+                feed.subscribe(deliver)
+                self.__feeds[feed_key] = feed
+                feed.start()
+
+        return feed
+
+    def __remove(self, feed):
+        with self.__lock:
+            if self.__feeds.get(feed.region_name.lower()) is feed:
+                self.logger.info(f"Finishing {feed.region_name} feed")
+                del self.__feeds[feed.region_name.lower()]
+
+    def is_followed(self, region_name):
+        """
+        Whether the region feed has any subscriber
+        """
+        with self.__lock:
+            feed = self.__feeds.get(region_name.lower())
+            return feed is not None and feed.subscribers_count() > 0
+
+    def followed_regions(self):
+        """
+        Returns the subscribers count of every followed region
+        """
+        with self.__lock:
+            return {
+                feed.region_name: feed.subscribers_count()
+                for feed in self.__feeds.values()
+            }
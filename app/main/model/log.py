@@ -1,6 +1,7 @@
 """Custom logging module"""
 import os
 import logging
+import threading
 from pathlib import Path
 
 from app.main.util.exceptions import LogFileCreationError
@@ -32,6 +33,42 @@ class ApiLogger:
                 If not informed and record_log is True,
                 then the log will be created at current user folder
     """
+        # Handlers are only created on first use (no import side effects)
+        self.__logger = None
+        self.__configured = False
+        self.__setup_lock = threading.Lock()
+        self.__settings = dict(
+            logger_name=logger_name,
+            logger_level=logger_level,
+            record_log=record_log,
+            log_file_path=log_file_path
+        )
+
+    def configure(self):
+        """
+        Configures the logger handlers (if not configured yet), raising
+        LogFileCreationError for an unwritable log file path
+        """
+        self.__get_logger()
+
+    def __get_logger(self):
+        """
+        Returns the configured logger, configuring it on first use
+        """
+        if not self.__configured:
+            with self.__setup_lock:
+                if not self.__configured:
+                    self.__setup_logger(**self.__settings)
+                    self.__configured = True
+
+        return self.__logger
+
+    def __setup_logger(
+        self, logger_name, logger_level, record_log, log_file_path
+    ):
+        """
+        Creates the logger and its stream and file handlers
+        """
         # Logger creation (or recovery if already existent)
         self.__logger = logging.getLogger(logger_name)
         self.__logger.setLevel(logger_level)
@@ -102,7 +139,7 @@ class ApiLogger:
             message: (str)
                 Message to be logged
         """
-        self.__logger.debug(message)
+        self.__get_logger().debug(message)
 
     def info(self, message):
         """
@@ -112,7 +149,7 @@ class ApiLogger:
             message: (str)
                 Message to be logged
         """
-        self.__logger.info(message)
+        self.__get_logger().info(message)
 
     def warn(self, message):
         """
@@ -122,7 +159,7 @@ class ApiLogger:
             message: (str)
                 Message to be logged
         """
-        self.__logger.warning(message)
+        self.__get_logger().warning(message)
 
     def error(self, message):
         """
@@ -132,7 +169,7 @@ class ApiLogger:
             message: (str)
                 Message to be logged
         """
-        self.__logger.error(message)
+        self.__get_logger().error(message)
 
     def __parse_file_path(self, log_file_path):
         """
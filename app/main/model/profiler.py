@@ -0,0 +1,133 @@
+""" On-demand request profiling module """
+import re
+import hmac
+import cProfile
+import itertools
+from pathlib import Path
+from datetime import datetime
+
+from flask import g, request
+
+
+class RequestProfiler:
+    """
+    Runs selected requests under cProfile, writing one profile file
+    (pstats format, readable by snakeviz, flameprof or gprof2dot) per
+    request. Requests are selected by the admin token (header or query
+    flag) or by sampling. Disabled profilers install no hook at all
+
+    Attributes:
+        output_dir (pathlib.Path): Where profile files are written
+
+        sample_rate (int): Profiles 1 in 'sample_rate' requests (0: never)
+
+        logger (stocks_api.log.ApiLogger): The application logger
+    """
+
+    TOKEN_HEADER = "X-Profile-Token"
+    TOKEN_ARGUMENT = "profile"
+
+    def __init__(self, output_dir, logger, admin_token="", sample_rate=0,
+                 paths=("/stocks",)):
+        """
+        Request profiler class constructor
+
+        Arguments:
+            output_dir (str): Where profile files are written
+
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            admin_token (str): Optional token requesting a profile
+                ('X-Profile-Token' header or 'profile' query argument).
+                Empty: profiling on demand disabled
+
+            sample_rate (int): Optional 1 in N requests sampling (0: never)
+
+            paths (tuple): Optional profiled request paths
+        """
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        self.logger = logger
+
+        self.__admin_token = admin_token
+        self.__paths = paths
+        self.__requests_count = itertools.count()
+
+    @property
+    def enabled(self):
+        return bool(self.__admin_token) or self.sample_rate > 0
+
+    def install(self, app, describe):
+        """
+        Registers the profiling hooks on the application (if enabled)
+
+        Arguments:
+            app (flask.Flask): The profiled application
+
+            describe (callable): Returns the (region, cache outcome) tags
+                of the current request, before it is handled
+        """
+        if not self.enabled:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        @app.before_request
+        def start_profile():
+            if request.path not in self.__paths or not self.__selected():
+                return
+
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                self.logger.error("Profiler busy, request not profiled")
+                return
+
+            # Tags computed under the profile, keeping the call tree whole
+            g.profile, g.profile_tags = profile, describe()
+
+        @app.after_request
+        def write_profile(response):
+            profile = g.pop("profile", None)
+            if profile is not None:
+                profile.disable()
+                path = self.__write(profile, *g.pop("profile_tags"))
+                response.headers["X-Profile"] = path.name
+
+            return response
+
+        @app.teardown_request
+        def stop_profile(_):
+            profile = g.pop("profile", None)
+            if profile is not None:
+                profile.disable()
+
+    def __selected(self):
+        """
+        Checks if the current request must be profiled
+        """
+        token = request.headers.get(self.TOKEN_HEADER) or request.args.get(
+            self.TOKEN_ARGUMENT)
+        # Compared as bytes (non-ASCII strings can not be compared)
+        if self.__admin_token and token and hmac.compare_digest(
+                token.encode(), self.__admin_token.encode()):
+            return True
+
+        return self.sample_rate > 0 and (
+            next(self.__requests_count) % self.sample_rate == 0)
+
+    def __write(self, profile, region_name, cache_outcome):
+        """
+        Dumps the profile, tagged with the region and cache outcome
+        """
+        path = self.output_dir / "{}_{}_{}.prof".format(
+            datetime.now().strftime("%Y%m%dT%H%M%S%f"),
+            re.sub(r"[^a-z]+", "_", region_name.lower()),
+            cache_outcome
+        )
+
+        profile.dump_stats(path)
+        self.logger.info(f"Request profile written to {path}")
+
+        return path
@@ -1,10 +1,8 @@
-""" Selenium custom scrapping class """
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support import expected_conditions as EC
+""" Selenium custom scrapping class
 
+Selenium and webdriver_manager are only imported when a driver is
+generated, keeping them out of the application startup.
+"""
 from app.main.util.exceptions import DriverGenerationError, ElementNotFoundError
 
 
@@ -18,6 +16,8 @@ class ChromeScrapper:
         driver (selenium.webdriver.Chrome): Selenium scrapping driver
 
         wait (selenium.webdriver.Chrome): Selenium scrapping wait
+
+        navigation_count (int): Number of navigations done by the driver
     """
 
     def __init__(self, logger, driver_wait_time=30, headless=False):
@@ -33,6 +33,7 @@ class ChromeScrapper:
         """
         # Logger attribute generation
         self.logger = logger
+        self.navigation_count = 0
 
         # Driver and Wait objects generation
         self.driver, self.wait = self.__generate_driver(
@@ -55,6 +56,10 @@ class ChromeScrapper:
 
             headless (bool): Optional flag to run driver on headless mode
         """
+        from selenium import webdriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        from webdriver_manager.chrome import ChromeDriverManager
+
         try:
             # Driver options definition
             self.logger.info("Selenium driver options definition")
@@ -92,6 +97,7 @@ class ChromeScrapper:
         Navigates to informed page
         """
         self.logger.info(f"Navigating to {page_url}")
+        self.navigation_count += 1
         self.driver.get(page_url)
 
     def reload_current_page(self):
@@ -99,12 +105,22 @@ class ChromeScrapper:
         Reloads current page
         """
         self.logger.info(f"Reloading {self.driver.current_url}")
+        self.navigation_count += 1
         self.driver.get(self.driver.current_url)
 
+    def read_current_url(self):
+        """
+        Returns current page url
+        """
+        return self.driver.current_url
+
     def wait_element(self, element_xpath):
         """
         Wait until element is present on page
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             self.logger.info(f"Waiting element: {element_xpath}")
 
@@ -171,6 +187,13 @@ class ChromeScrapper:
         """
         return self.driver.page_source
 
+    def browser_pid(self):
+        """
+        Returns the driver (chromedriver) process id,
+        root of the whole browser process tree
+        """
+        return self.driver.service.process.pid
+
     def exit_navigation(self):
         """
         Securely finalizes driver navigation
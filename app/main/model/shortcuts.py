@@ -0,0 +1,95 @@
+""" Screener url shortcuts module """
+import os
+import json
+import threading
+from pathlib import Path
+
+
+class ScreenerShortcuts:
+    """
+    Persisted screener url of every already scrapped region. The url
+    encodes the region query, so later scrapes can open the results
+    straight away instead of replaying the filter clicks
+
+    Attributes:
+        file_path (pathlib.Path): JSON file holding the shortcuts
+
+        logger (stocks_api.log.ApiLogger): The application logger
+    """
+
+    def __init__(self, file_path, logger):
+        """
+        Screener shortcuts class constructor
+
+        Arguments:
+            file_path (str): JSON file holding the shortcuts
+
+            logger (stocks_api.log.ApiLogger): The application logger
+        """
+        self.file_path = Path(file_path)
+        self.logger = logger
+
+        self.__lock = threading.Lock()
+        self.__shortcuts = dict()
+        self.__loaded_mtime = None
+
+    def __refresh(self):
+        """
+        (Re)loads the shortcuts file whenever it was changed,
+        possibly by another process
+        """
+        try:
+            mtime = self.file_path.stat().st_mtime
+        except OSError:
+            return
+
+        if mtime == self.__loaded_mtime:
+            return
+
+        try:
+            with open(self.file_path) as shortcuts_file:
+                self.__shortcuts = json.load(shortcuts_file)
+        except (OSError, ValueError) as ex:
+            self.logger.error(f"Failed to load screener shortcuts: {ex}")
+            self.__shortcuts = dict()
+
+        self.__loaded_mtime = mtime
+
+    def __persist(self):
+        """
+        Replaces the shortcuts file (atomically)
+        """
+        temporary_path = self.file_path.with_name(
+            f"{self.file_path.name}.{os.getpid()}.tmp")
+
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary_path, "w") as shortcuts_file:
+                json.dump(self.__shortcuts, shortcuts_file, indent=4)
+            temporary_path.replace(self.file_path)
+            self.__loaded_mtime = self.file_path.stat().st_mtime
+        except OSError as ex:
+            self.logger.error(f"Failed to persist screener shortcuts: {ex}")
+
+    def get(self, region_name):
+        """
+        Returns the region screener url (None if not recorded)
+        """
+        with self.__lock:
+            self.__refresh()
+            return self.__shortcuts.get(region_name.lower())
+
+    def record(self, region_name, screener_url):
+        with self.__lock:
+            self.__refresh()
+            if self.__shortcuts.get(region_name.lower()) != screener_url:
+                self.logger.info(f"Recording {region_name} screener shortcut")
+                self.__shortcuts[region_name.lower()] = screener_url
+                self.__persist()
+
+    def forget(self, region_name):
+        with self.__lock:
+            self.__refresh()
+            if self.__shortcuts.pop(region_name.lower(), None) is not None:
+                self.logger.info(f"Forgetting {region_name} screener shortcut")
+                self.__persist()
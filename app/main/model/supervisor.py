@@ -0,0 +1,271 @@
+""" Browser processes supervision module """
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+
+import psutil
+
+
+class BrowserSession:
+    """
+    A supervised scrapper and every process spawned by its browser
+
+    Attributes:
+        scrapper (ChromeScrapper): The supervised scrapper
+
+        processes (dict): Known processes of the browser tree, by pid
+    """
+
+    def __init__(self, scrapper):
+        self.scrapper = scrapper
+        self.processes = dict()
+        self.refresh_processes()
+
+    def refresh_processes(self):
+        """
+        Records the current browser process tree
+        (chromedriver and every chrome process below it)
+        """
+        try:
+            root = psutil.Process(self.scrapper.browser_pid())
+            for process in [root] + root.children(recursive=True):
+                self.processes.setdefault(process.pid, process)
+        except (psutil.Error, AttributeError, TypeError):
+            pass
+
+    def is_alive(self):
+        """
+        Checks if the browser driver process is still running
+        """
+        try:
+            return psutil.Process(self.scrapper.browser_pid()).is_running()
+        except (psutil.Error, AttributeError, TypeError):
+            return False
+
+    def rss(self):
+        """
+        Resident memory (in bytes) of the whole browser process tree
+        """
+        self.refresh_processes()
+
+        resident_bytes = 0
+        for process in list(self.processes.values()):
+            try:
+                resident_bytes += process.memory_info().rss
+            except psutil.Error:
+                self.processes.pop(process.pid, None)
+
+        return resident_bytes
+
+
+class BrowserSupervisor:
+    """
+    Keeps track of every spawned browser, recycling sessions after
+    too many navigations or too much memory, and killing orphan processes
+
+    Attributes:
+        logger (stocks_api.log.ApiLogger): The application logger
+    """
+
+    def __init__(self, logger, scrapper_factory, max_navigations=50,
+                 max_rss_bytes=1024 * 1024 ** 2, max_idle=4):
+        """
+        Browser supervisor class constructor
+
+        Arguments:
+            logger (stocks_api.log.ApiLogger): The application logger
+
+            scrapper_factory (callable): Creates a new scrapper
+
+            max_navigations (int): Optional navigations count
+                after which a browser is recycled
+
+            max_rss_bytes (int): Optional resident memory (in bytes)
+                after which a browser is recycled
+
+            max_idle (int): Optional maximum of idle browsers kept alive
+        """
+        self.logger = logger
+        self.__scrapper_factory = scrapper_factory
+        self.__max_navigations = max_navigations
+        self.__max_rss_bytes = max_rss_bytes
+        self.__max_idle = max_idle
+
+        self.__lock = threading.Lock()
+        self.__idle = list()
+        self.__busy = dict()
+        self.__orphans = dict()
+        self.__discarded = list()
+        self.__recycled_count = 0
+        self.__killed_count = 0
+
+        atexit.register(self.shutdown)
+        os.register_at_fork(after_in_child=self.__forget_sessions)
+
+    def __forget_sessions(self):
+        """
+        Drops the sessions inherited from the parent process
+        (its browsers must not be reused nor killed by forked workers)
+        """
+        self.__lock = threading.Lock()
+        self.__idle = list()
+        self.__busy = dict()
+        self.__orphans = dict()
+        self.__discarded = list()
+
+    @contextmanager
+    def session(self):
+        """
+        Lends a scrapper for the block execution. The browser is
+        discarded if the block raises, otherwise it is kept for reuse
+        """
+        scrapper = self.acquire()
+        try:
+            yield scrapper
+        except BaseException:
+            self.release(scrapper, reusable=False)
+            raise
+        else:
+            self.release(scrapper)
+
+    def acquire(self):
+        """
+        Returns an idle scrapper (if available) or a new one
+        """
+        self.reap_orphans()
+
+        with self.__lock:
+            while self.__idle:
+                session = self.__idle.pop()
+                if session.is_alive():
+                    self.__busy[id(session.scrapper)] = session
+                    return session.scrapper
+
+                self.__discard(session, "driver process died")
+
+        self.logger.info("Supervisor: spawning new browser")
+        session = BrowserSession(self.__scrapper_factory())
+
+        with self.__lock:
+            self.__busy[id(session.scrapper)] = session
+
+        return session.scrapper
+
+    def release(self, scrapper, reusable=True):
+        """
+        Gives back a scrapper. It is recycled if it is not reusable
+        or if it exceeded the navigations or memory thresholds
+        """
+        with self.__lock:
+            session = self.__busy.pop(id(scrapper), None)
+            if session is None:
+                return
+
+            if not reusable:
+                self.__discard(session, "failed scrape")
+            elif scrapper.navigation_count >= self.__max_navigations:
+                self.__discard(session, "navigations threshold reached")
+            elif session.rss() >= self.__max_rss_bytes:
+                self.__discard(session, "memory threshold reached")
+            elif len(self.__idle) >= self.__max_idle:
+                self.__discard(session, "idle pool is full")
+            else:
+                self.__idle.append(session)
+
+        self.reap_orphans()
+
+    def __discard(self, session, reason):
+        """
+        Schedules the session browser for closure
+        (must be called holding the lock)
+        """
+        self.logger.info(f"Supervisor: recycling browser ({reason})")
+        self.__recycled_count += 1
+        self.__discarded.append(session)
+
+    def __quit_discarded(self):
+        """
+        Quits the discarded browsers, marking their processes as orphans
+        """
+        with self.__lock:
+            discarded, self.__discarded = self.__discarded, list()
+
+        for session in discarded:
+            session.refresh_processes()
+            session.scrapper.exit_navigation()
+
+            with self.__lock:
+                self.__orphans.update(session.processes)
+
+    def reap_orphans(self):
+        """
+        Kills every known browser process not owned by a live session
+        """
+        with self.__lock:
+            for session in list(self.__idle):
+                if not session.is_alive():
+                    self.__idle.remove(session)
+                    self.__discard(session, "driver process died")
+
+            owned = set()
+            for session in self.__idle + list(self.__busy.values()):
+                session.refresh_processes()
+                owned.update(session.processes)
+
+        self.__quit_discarded()
+
+        with self.__lock:
+            orphans = [
+                process for pid, process in self.__orphans.items()
+                if pid not in owned
+            ]
+            self.__orphans = dict()
+
+        alive = list()
+        for process in orphans:
+            try:
+                if process.is_running():
+                    process.kill()
+                    alive.append(process)
+            except psutil.Error:
+                pass
+
+        if alive:
+            psutil.wait_procs(alive, timeout=3)
+            self.logger.info(f"Supervisor: {len(alive)} orphan processes killed")
+
+            with self.__lock:
+                self.__killed_count += len(alive)
+
+    def stats(self):
+        """
+        Reports live browsers and their resident memory
+        """
+        self.reap_orphans()
+
+        with self.__lock:
+            sessions = self.__idle + list(self.__busy.values())
+
+            return {
+                "live_browsers": len(sessions),
+                "busy_browsers": len(self.__busy),
+                "idle_browsers": len(self.__idle),
+                "processes": sum(len(session.processes) for session in sessions),
+                "rss_bytes": sum(session.rss() for session in sessions),
+                "recycled_browsers": self.__recycled_count,
+                "killed_orphans": self.__killed_count
+            }
+
+    def shutdown(self):
+        """
+        Quits every browser and kills all of their processes
+        """
+        with self.__lock:
+            for session in self.__idle + list(self.__busy.values()):
+                self.__discard(session, "shutdown")
+
+            self.__idle = list()
+            self.__busy = dict()
+
+        self.reap_orphans()
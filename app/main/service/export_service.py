@@ -0,0 +1,128 @@
+""" Bulk regions export functions """
+import re
+import time
+from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cachelib import NullCache
+
+from app.main.config import logger
+from app.main.model.checkpoint import ScrapeCheckpoint
+from app.main.model.export_writer import writers_by_format
+from app.main.service.stocks_service import (
+    supervisor, admission, scrape_region_stocks, cached_region_stocks
+)
+
+
+class StreamingCheckpoint(ScrapeCheckpoint):
+    """
+    Transient checkpoint handing every recovered page to a writer.
+    Only page boundaries are kept, never the page records
+    """
+
+    def __init__(self, region_name, writer):
+        super().__init__(region_name, uuid4().hex, store=NullCache())
+        self.__writer = writer
+
+    def save_page(self, first, last, total, records):
+        self.__writer.write_page(records)
+        super().save_page(first, last, total, [])
+
+
+def export_regions(flask_app, regions, output_dir, file_format="ndjson",
+                   workers=2, max_age=0):
+    """
+    Exports the stocks of every informed region to its own file,
+    scrapping up to 'workers' regions in parallel.
+    Regions exported less than 'max_age' seconds ago are skipped.
+    Returns the export summary
+    """
+    if file_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow installed")
+
+    writer_class = writers_by_format[file_format]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = dict(
+        exported=[], skipped=[], partial=[], failed=[], rows=0)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        exports = {
+            executor.submit(
+                export_region, flask_app, region_name,
+                output_dir, writer_class, max_age
+            ): region_name
+            for region_name in regions
+        }
+
+        for export in as_completed(exports):
+            region_name = exports[export]
+            try:
+                status, rows_count = export.result()
+            except Exception as ex:
+                logger.error(f"Failed to export {region_name}: {ex}")
+                status, rows_count = "failed", 0
+
+            summary[status].append(region_name)
+            summary["rows"] += rows_count
+
+    summary["elapsed"] = time.perf_counter() - start
+    summary["rows_per_second"] = summary["rows"] / summary["elapsed"]
+    summary["regions_per_minute"] = 60 * (
+        len(summary["exported"]) + len(summary["partial"])
+    ) / summary["elapsed"]
+
+    return summary
+
+
+def export_region(flask_app, region_name, output_dir, writer_class,
+                  max_age=0):
+    """
+    Exports one region stocks, writing each page as it is recovered.
+    The file only gets its final name once the region is complete.
+    Returns the export status and the number of written stocks
+    """
+    path = output_dir / "{}.{}".format(
+        re.sub(r"[^a-z]+", "_", region_name.lower()), writer_class.extension)
+
+    if path.is_file() and time.time() - path.stat().st_mtime < max_age:
+        logger.info(f"Skipping {region_name}: exported file still fresh")
+        return "skipped", 0
+
+    partial_path = path.with_name(path.name + ".part")
+    writer = writer_class(partial_path, region_name)
+
+    try:
+        with flask_app.app_context():
+            stocks = cached_region_stocks(region_name)
+
+        # Cached snapshot: written straight away
+        if stocks is not None:
+            logger.info(f"Exporting {region_name} from cached snapshot")
+            writer.write_stocks([
+                dict(region=region_name, **stock) for stock in stocks.values()
+            ])
+            complete = True
+
+        # Otherwise, region scrape streaming pages to the writer
+        else:
+            logger.info(f"Exporting {region_name} from a new scrape")
+            checkpoint = StreamingCheckpoint(region_name, writer)
+            with admission.prioritized(), admission.admit(bounded=False), \
+                    supervisor.session() as scrapper:
+                scrape_region_stocks(scrapper, region_name, checkpoint)
+            complete = checkpoint.is_complete()
+
+    finally:
+        writer.close()
+
+    if not complete:
+        logger.error(f"Partial export of {region_name}: {partial_path}")
+        return "partial", writer.rows_count
+
+    partial_path.replace(path)
+    return "exported", writer.rows_count
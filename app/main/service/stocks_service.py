@@ -1,15 +1,54 @@
-""" Stocks recovery functions """
+""" Stocks recovery functions
+
+Heavy dependencies (pandas, bs4) are imported on first use,
+keeping them out of the application startup.
+"""
 import re
-import pandas as pd
+from contextlib import nullcontext
 from decouple import config
-from bs4 import BeautifulSoup
 
 from app.main.config import cache, Config, logger
 from app.main.model.scrapping import ChromeScrapper
+from app.main.model.feed import FeedHub
+from app.main.model.cluster import ClusterRouter
+from app.main.model.checkpoint import ScrapeCheckpoint
+from app.main.model.admission import AdmissionController
+from app.main.model.shortcuts import ScreenerShortcuts
+from app.main.model.supervisor import BrowserSupervisor
 
 from app.main.util.xpath import xpath_info
-from app.main.util.data_manipulation import format_stock
-from app.main.util.exceptions import InexistentRegionError
+from app.main.util.data_manipulation import normalize_stocks, screener_page_url
+from app.main.util.exceptions import (
+    InternalError, InexistentRegionError, PartialScrapeError,
+    ScrapeQueueFullError
+)
+
+supervisor = BrowserSupervisor(
+    logger,
+    lambda: ChromeScrapper(
+        logger,
+        driver_wait_time=config("SCRAPPER_WAIT_TIME", cast=int),
+        headless=config("SCRAPPER_HEADLESS_NAVIGATION", cast=bool)
+    ),
+    max_navigations=Config.SCRAPPER_MAX_NAVIGATIONS,
+    max_rss_bytes=Config.SCRAPPER_MAX_RSS_MB * 1024 ** 2,
+    max_idle=Config.SCRAPPER_MAX_WORKERS
+)
+admission = AdmissionController(
+    logger,
+    max_concurrent=Config.SCRAPPER_MAX_CONCURRENT,
+    queue_size=Config.SCRAPPER_QUEUE_SIZE,
+    max_wait=Config.SCRAPPER_QUEUE_TIMEOUT
+)
+feed_hub = FeedHub(logger, interval=Config.FEED_REFRESH_INTERVAL)
+cluster = ClusterRouter(
+    logger,
+    Config.CLUSTER_NODES,
+    Config.CLUSTER_SELF,
+    timeout=Config.CLUSTER_TIMEOUT,
+    retry_interval=Config.CLUSTER_RETRY_INTERVAL
+)
+screener_shortcuts = ScreenerShortcuts(Config.SHORTCUTS_FILE_PATH, logger)
 
 
 @cache.memoize(Config.CACHE_TIMEOUT)
@@ -17,44 +56,168 @@ def recover_region_stocks(region_name):
     """
     Scraps over Yahoo portal to find all stocks on informed region
     """
+    import pandas as pd
+
     logger.info("Starting region stocks obtention")
 
-    logger.info("Generating scrapper")
-    scrapper = ChromeScrapper(
-        logger,
-        driver_wait_time=config("SCRAPPER_WAIT_TIME", cast=int),
-        headless=config("SCRAPPER_HEADLESS_NAVIGATION", cast=bool)
-    )
+    logger.info("Opening scrape checkpoint")
+    checkpoint = ScrapeCheckpoint.open(region_name)
+
+    # Followed regions (hot traffic) go ahead of other client scrapes
+    logger.info("Waiting scrape admission")
+    with (admission.prioritized() if feed_hub.is_followed(region_name)
+          else nullcontext()), admission.admit():
+        logger.info("Acquiring scrapper")
+        with supervisor.session() as scrapper:
+            stock_information = scrape_region_stocks(
+                scrapper, region_name, checkpoint)
+
+    logger.info("Parsing information to final format")
+    stock_information = normalize_stocks(pd.DataFrame.from_records(
+        stock_information, columns=["name", "symbol", "price"]))
+
+    if not checkpoint.is_complete():
+        recovered, total = checkpoint.coverage()
+        logger.error(f"Returning partial results: {recovered} of {total}")
+        raise PartialScrapeError(stock_information, recovered, total)
+
+    logger.info("Closing scrape checkpoint")
+    checkpoint.close()
+
+    logger.info("Region stocks successfully obtained!")
+    return stock_information
+
 
-    logger.info("Navigating to target stocks page")
-    print(config("YAHOO_STOCKS_URL"))
-    scrapper.navigate_to(config("YAHOO_STOCKS_URL"))
+def scrape_region_stocks(scrapper, region_name, checkpoint):
+    """
+    Drives the scrapper through the Yahoo screener, recovering
+    the raw stock records of the informed region
+    """
+    screener_url = screener_shortcuts.get(region_name)
+
+    if screener_url is not None:
+        try:
+            logger.info("Opening region screener shortcut")
+            open_screener_shortcut(scrapper, screener_url)
+        except Exception as ex:
+            logger.error(f"Screener shortcut failed, filtering again: {ex}")
+            screener_shortcuts.forget(region_name)
+            screener_url = None
 
-    logger.info("Removing original filtering buttons")
-    remove_original_filtering_buttons(scrapper)
+    if screener_url is None:
+        logger.info("Navigating to target stocks page")
+        scrapper.navigate_to(config("YAHOO_STOCKS_URL"))
 
-    logger.info("Opening region filter")
-    open_region_filter(scrapper)
+        logger.info("Removing original filtering buttons")
+        remove_original_filtering_buttons(scrapper)
 
-    logger.info("Selecting informed region (if existent)")
-    select_informed_region(scrapper, region_name)
+        logger.info("Opening region filter")
+        open_region_filter(scrapper)
 
-    logger.info("Expanding results table (if necessary)")
-    expand_stocks_table(scrapper)
+        logger.info("Selecting informed region (if existent)")
+        select_informed_region(scrapper, region_name)
+
+        logger.info("Expanding results table (if necessary)")
+        expand_stocks_table(scrapper)
+
+        screener_url = scrapper.read_current_url()
 
     logger.info("Recovering stocks information")
-    stock_information = recover_stocks(scrapper)
+    stock_records = recover_stocks(scrapper, checkpoint)
 
-    logger.info("Parsing information to final format")
-    stock_information = {
-        stock['symbol']: format_stock(stock)
-        for stock in stock_information
-    }
+    # Shortcut only recorded after a successful scrape
+    if checkpoint.is_complete():
+        screener_shortcuts.record(region_name, screener_url)
+
+    return stock_records
+
+
+def open_screener_shortcut(scrapper, screener_url):
+    """
+    Navigates straight to the first (100 rows) results page
+    of an already filtered screener
+    """
+    scrapper.navigate_to(screener_page_url(screener_url, 0, count=100))
+
+    scrapper.wait_element(xpath_info['matching_stocks_evidence'])
+
+
+def cached_region_stocks(region_name):
+    """
+    Returns the cached region stocks (None if not cached), never scrapping
+    """
+    return cache.get(recover_region_stocks.make_cache_key(
+        recover_region_stocks.uncached, region_name))
+
+
+def refresh_region_stocks(region_name):
+    """
+    Scraps the region again (pre-warm priority), replacing its cached stocks
+    """
+    with admission.prioritized():
+        stock_information = recover_region_stocks.uncached(region_name)
+
+    cache.set(
+        recover_region_stocks.make_cache_key(
+            recover_region_stocks.uncached, region_name),
+        stock_information,
+        timeout=Config.CACHE_TIMEOUT
+    )
 
-    logger.info("Region stocks successfully obtained!")
     return stock_information
 
 
+def follow_region(flask_app, region_name, deliver):
+    """
+    Subscribes 'deliver' to the region price changes feed.
+    On cluster mode, snapshots are taken from the region owner instance
+    (scrapping locally only when the owner is down).
+    Returns the followed feed (to unsubscribe from)
+    """
+    def load():
+        stocks = owner_region_stocks(region_name)
+        if stocks is not None:
+            return stocks
+
+        with flask_app.app_context(), admission.prioritized():
+            return recover_region_stocks(region_name)
+
+    def refresh():
+        stocks = owner_region_stocks(region_name)
+        if stocks is not None:
+            return stocks
+
+        with flask_app.app_context():
+            return refresh_region_stocks(region_name)
+
+    return feed_hub.subscribe(region_name, deliver, load, refresh)
+
+
+def owner_region_stocks(region_name):
+    """
+    On cluster mode, requests the region stocks to its owner instance.
+    Returns None when the region is served by this instance
+    (or its owner is down), raising the owner errors otherwise
+    """
+    owner = cluster.owner(region_name)
+    response = None if owner is None else cluster.forward(owner, region_name)
+    if response is None:
+        return None
+
+    stocks, status, headers = response
+    if status == 200:
+        return stocks
+    elif status == 206:
+        recovered, total = map(int, headers["X-Stocks-Coverage"].split("/"))
+        raise PartialScrapeError(stocks, recovered, total)
+    elif status == 400:
+        raise InexistentRegionError(stocks["error"])
+    elif status == 429:
+        raise ScrapeQueueFullError(int(headers["Retry-After"]))
+    else:
+        raise InternalError(f"Owner {owner} failed: {stocks['error']}")
+
+
 def remove_original_filtering_buttons(scrapper):
     """
     Removes original filtering info, for execution protection
@@ -122,21 +285,32 @@ def expand_stocks_table(scrapper):
                 transformation_wait_count += 1
 
 
-def recover_stocks(scrapper):
+def recover_stocks(scrapper, checkpoint):
     """
-    Recovers all stocks informed, concerning all possible paginations
+    Recovers all stocks informed, concerning all possible paginations.
+    Every page is recorded on the checkpoint, so a retry resumes
+    from the first missing offset
     """
     last_first = 0
     retry_count = 0
     reload_count = 0
-    stock_information = list()
+
+    if checkpoint.next_offset > 0:
+        logger.info(f"Resuming scrape from offset {checkpoint.next_offset}")
+        try:
+            jump_to_offset(scrapper, checkpoint.next_offset)
+        except Exception as ex:
+            logger.error(f"Offset jump failed, paginating from start: {ex}")
 
     while True:
         try:
             first, last, total = recover_result_metrics(scrapper)
         except Exception as ex:
-            if reload_count == 0:
+            if reload_count == 0 and not checkpoint.pages:
                 raise ex
+            elif reload_count == 0:
+                logger.error(f"Failed to recover result metrics: {ex}")
+                break
 
         if first == last_first:
             logger.debug("skipping repeated")
@@ -149,7 +323,6 @@ def recover_stocks(scrapper):
 
             if reload_count > config("SCRAPPER_RELOAD_COUNT", cast=int):
                 logger.error("Failed to obtain all records")
-                logger.error("Returning partial results")
                 break
 
             continue
@@ -158,25 +331,40 @@ def recover_stocks(scrapper):
             retry_count = 0
             reload_count = 0
 
-        logger.info(f"Recovering from {first} to {last} of {total}")
-
-        # Page information recovery
-        stock_information += recover_tabular_information(
-            scrapper.read_page_source())
+        # Page information recovery (already checkpointed pages are skipped)
+        if checkpoint.has_page(first):
+            logger.info(f"Skipping checkpointed {first} to {last} of {total}")
+        else:
+            logger.info(f"Recovering from {first} to {last} of {total}")
+            checkpoint.save_page(
+                first, last, total,
+                recover_tabular_information(scrapper.read_page_source())
+            )
 
         # Jumping to next page
         if last < total:
-            execute_next_page_jump(scrapper)
+            try:
+                execute_next_page_jump(scrapper)
+            except Exception as ex:
+                logger.error(f"Failed to jump to next page: {ex}")
+                break
             last_first = first
 
         # Last page evidence: breaking
         else:
             break
 
-    return stock_information
+    return checkpoint.records()
 
 
 def recover_tabular_information(page_source):
+    """
+    Parses the results table of the page source into raw stock records
+    (normalization happens once, over the whole region)
+    """
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
     data_table = BeautifulSoup(page_source, "html.parser").select_one("table")
     stocks_page = pd.read_html(str(data_table))[-1]
 
@@ -184,7 +372,7 @@ def recover_tabular_information(page_source):
         "Name": "name",
         "Symbol": "symbol",
         "Price (Intraday)": "price"
-    }).fillna("").to_dict("records")
+    }).to_dict("records")
 
     return tabular_information
 
@@ -204,6 +392,16 @@ def recover_result_metrics(scrapper):
     return first, last, total
 
 
+def jump_to_offset(scrapper, offset):
+    """
+    Navigates straight to the results page starting at informed offset
+    """
+    scrapper.navigate_to(
+        screener_page_url(scrapper.read_current_url(), offset))
+
+    scrapper.wait_element(xpath_info['matching_stocks_evidence'])
+
+
 def execute_next_page_jump(scrapper):
     """
     Clicks on 'Next Page' link
@@ -1,4 +1,8 @@
 """ Data manipulation routines """
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+# Multipliers of the abbreviated prices informed by Yahoo (e.g. "12.3k")
+PRICE_SUFFIXES = {"": 1, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
 
 
 def format_stock(stock):
@@ -12,3 +16,93 @@ def format_stock(stock):
     }
 
     return parsed_stock
+
+
+def normalize_stocks(stocks_frame):
+    """
+    Normalizes the scrapped stocks table as whole columns:
+    prices are coerced to numbers ("1,234.56", "12.3k"), rounded and
+    formatted, missing values are handled and symbols are deduplicated.
+    Returns the formatted stocks indexed by symbol
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Price coercion: numeric values are taken as they are, and only
+    # the remaining texts are parsed ("1,234.56", "12.3k", "N/A" ...)
+    raw_prices = stocks_frame["price"]
+    prices = pd.to_numeric(raw_prices, errors="coerce")
+
+    texts = raw_prices[prices.isna() & raw_prices.notna()]
+    if len(texts) > 0:
+        price_parts = (
+            texts.astype(str).str.strip()
+            .str.replace(",", "", regex=False)
+            .str.extract(r"^([-+]?\d*\.?\d+)\s*([kKmMbBtT]?)$")
+        )
+        prices[texts.index] = (
+            pd.to_numeric(price_parts[0], errors="coerce") *
+            price_parts[1].str.upper().map(PRICE_SUFFIXES)
+        )
+
+    prices = prices.round(2).to_numpy(dtype=float)
+
+    # Symbol deduplication (first occurrence wins)
+    symbols = stocks_frame["symbol"].fillna("").astype(str).str.strip()
+    keep = ((symbols != "") & ~symbols.duplicated()).to_numpy()
+
+    # Bulk formatting (missing prices are informed as null)
+    formatted_prices = np.where(
+        np.isnan(prices), None, np.char.mod("%.2f", prices))
+
+    return {
+        symbol: {"symbol": symbol, "name": name, "price": price}
+        for symbol, name, price in zip(
+            symbols.to_numpy()[keep].tolist(),
+            stocks_frame["name"].fillna("").astype(str).to_numpy()[keep].tolist(),
+            formatted_prices[keep].tolist()
+        )
+    }
+
+
+def diff_snapshots(previous, current):
+    """
+    Compares two region snapshots (stocks indexed by symbol),
+    returning the added and changed stocks and the removed symbols.
+    Changed stocks carry their previous price and the price delta
+    """
+    changed = dict()
+    for symbol in previous.keys() & current.keys():
+        before, after = previous[symbol], current[symbol]
+        if before == after:
+            continue
+
+        try:
+            delta = f"{float(after['price']) - float(before['price']):.2f}"
+        except (TypeError, ValueError):
+            delta = None
+
+        changed[symbol] = dict(
+            after, previous_price=before['price'], delta=delta)
+
+    return {
+        "added": {
+            symbol: current[symbol]
+            for symbol in current.keys() - previous.keys()
+        },
+        "removed": sorted(previous.keys() - current.keys()),
+        "changed": changed
+    }
+
+
+def screener_page_url(screener_url, offset, count=100):
+    """
+    Builds the screener url pointing to the results page
+    starting at the informed (zero based) offset
+    """
+    parsed_url = urlparse(screener_url)
+
+    query = parse_qs(parsed_url.query)
+    query.update(offset=[str(offset)], count=[str(count)])
+
+    return urlunparse(parsed_url._replace(query=urlencode(query, doseq=True)))
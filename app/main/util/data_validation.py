@@ -2,10 +2,10 @@
 import re
 from urllib.parse import unquote_plus
 
-from app.main.config import cache, Config, logger
+from app.main.config import validation_cache, Config, logger
 
 
-@cache.memoize(Config.CACHE_TIMEOUT)
+@validation_cache.memoize(Config.CACHE_TIMEOUT)
 def validate_region_name(region_name):
     """
     Validates if region name is valid.
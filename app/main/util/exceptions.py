@@ -21,5 +21,29 @@ class ElementNotFoundError(InternalError):
     pass
 
 
+class PartialScrapeError(InternalError):
+    """
+    Raised when only part of the region stocks could be recovered.
+    Carries the partial stocks and the obtained coverage
+    """
+
+    def __init__(self, stocks, recovered, total):
+        super().__init__(f"Partial results: {recovered} of {total} records")
+        self.stocks = stocks
+        self.recovered = recovered
+        self.total = total
+
+
+class ScrapeQueueFullError(InternalError):
+    """
+    Raised when a scrape is not admitted (queue full or wait too long).
+    Carries the seconds the client should wait before retrying
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"Scrape queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
 class InexistentRegionError(UserError):
     pass
@@ -0,0 +1,13 @@
+# Regions offered by the Yahoo screener 'Region' filter
+regions_catalog = [
+    "Argentina", "Australia", "Austria", "Belgium", "Brazil", "Canada",
+    "Chile", "China", "Czech Republic", "Denmark", "Egypt", "Estonia",
+    "Finland", "France", "Germany", "Greece", "Hong Kong", "Hungary",
+    "Iceland", "India", "Indonesia", "Ireland", "Israel", "Italy", "Japan",
+    "Kuwait", "Latvia", "Lithuania", "Malaysia", "Mexico", "Netherlands",
+    "New Zealand", "Norway", "Pakistan", "Peru", "Philippines", "Poland",
+    "Portugal", "Qatar", "Russia", "Saudi Arabia", "Singapore",
+    "South Africa", "South Korea", "Spain", "Sri Lanka", "Suriname",
+    "Sweden", "Switzerland", "Taiwan", "Thailand", "Turkey",
+    "United Kingdom", "United States", "Venezuela", "Vietnam"
+]
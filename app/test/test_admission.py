@@ -0,0 +1,139 @@
+import time
+import unittest
+import threading
+from unittest import mock
+from contextlib import nullcontext, contextmanager
+
+from manage import app
+from app.main.service import stocks_service
+from app.main.model.admission import AdmissionController
+from app.main.util.exceptions import ScrapeQueueFullError
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestAdmissionController(unittest.TestCase):
+
+    def setUp(self):
+        self.admission = AdmissionController(
+            mock.Mock(), max_concurrent=1, queue_size=2, max_wait=5)
+
+    def test_rejects_scrapes_beyond_queue(self):
+
+        admitted = list()
+        release = threading.Event()
+
+        def scrape(name, prioritized=False):
+            with (self.admission.prioritized() if prioritized
+                  else nullcontext()):
+                with self.admission.admit():
+                    admitted.append(name)
+                    release.wait()
+
+        running = threading.Thread(target=scrape, args=("running",))
+        running.start()
+        wait_until(lambda: self.admission.stats()["running"] == 1)
+
+        waiters = [
+            threading.Thread(target=scrape, args=("normal",)),
+            threading.Thread(target=scrape, args=("prewarm", True))
+        ]
+        for waiter in waiters:
+            waiter.start()
+            wait_until(lambda: self.admission.stats()["queued"] == (
+                waiters.index(waiter) + 1))
+
+        with self.assertRaises(ScrapeQueueFullError) as rejection:
+            with self.admission.admit():
+                pass
+
+        self.assertGreaterEqual(rejection.exception.retry_after, 1)
+
+        release.set()
+        for thread in [running] + waiters:
+            thread.join()
+
+        # Pre-warm scrape admitted ahead of the earlier client scrape
+        self.assertListEqual(admitted, ["running", "prewarm", "normal"])
+
+        stats = self.admission.stats()
+        self.assertEqual((stats["admitted"], stats["rejected"]), (3, 1))
+        self.assertEqual((stats["running"], stats["queued"]), (0, 0))
+
+    def test_rejects_scrapes_waiting_too_long(self):
+
+        admission = AdmissionController(
+            mock.Mock(), max_concurrent=1, queue_size=2, max_wait=0.05)
+
+        with admission.admit():
+            with self.assertRaises(ScrapeQueueFullError):
+                with admission.admit():
+                    pass
+
+        self.assertEqual(admission.stats()["queued"], 0)
+
+    def test_unbounded_scrapes_wait_without_deadline(self):
+
+        admission = AdmissionController(
+            mock.Mock(), max_concurrent=1, queue_size=2, max_wait=0.05)
+
+        def scrape():
+            with admission.admit():
+                time.sleep(0.2)
+
+        running = threading.Thread(target=scrape)
+        running.start()
+        wait_until(lambda: admission.stats()["running"] == 1)
+
+        with admission.admit(bounded=False) as waited:
+            self.assertGreater(waited, admission.max_wait)
+
+        running.join()
+        self.assertEqual(admission.stats()["rejected"], 0)
+
+
+@contextmanager
+def fake_session():
+    yield None
+
+
+def fake_scrape(scrapper, region_name, checkpoint):
+    checkpoint.save_page(1, 1, 1, [
+        {"name": "First", "symbol": "FST", "price": "1.5"}])
+    return checkpoint.records()
+
+
+@mock.patch.object(stocks_service, "scrape_region_stocks", fake_scrape)
+@mock.patch.object(stocks_service.supervisor, "session", fake_session)
+@mock.patch.object(stocks_service, "admission")
+@mock.patch.object(stocks_service, "feed_hub")
+class TestScrapePriority(unittest.TestCase):
+
+    def recover(self, region_name):
+        with app.app_context():
+            return stocks_service.recover_region_stocks.uncached(region_name)
+
+    def test_followed_regions_are_prioritized(self, feed_hub, admission):
+
+        feed_hub.is_followed.return_value = True
+        self.recover("Argentina")
+
+        admission.prioritized.assert_called_once_with()
+        admission.admit.assert_called_once_with()
+
+    def test_other_client_scrapes_keep_normal_priority(
+            self, feed_hub, admission):
+
+        feed_hub.is_followed.return_value = False
+        self.recover("Brazil")
+
+        admission.prioritized.assert_not_called()
+        admission.admit.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
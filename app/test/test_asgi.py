@@ -0,0 +1,154 @@
+import json
+import asyncio
+import unittest
+from unittest import mock
+
+from manage import app
+from app.main import asgi
+from app.main.config import cache
+from app.main.asgi import AsyncStocksApp
+from app.main.controller import stocks
+from app.main.service.stocks_service import recover_region_stocks
+from app.main.util.exceptions import (
+    InexistentRegionError, PartialScrapeError, ScrapeQueueFullError
+)
+from app.benchmark.load_test import StubScrapeBackend
+
+
+async def request(asgi_app, path, query="", receive=None):
+    """
+    Sends a GET request to the ASGI application.
+    Returns the response status, headers and body
+    """
+    messages = list()
+
+    async def send(message):
+        messages.append(message)
+
+    async def request_received():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    await asgi_app({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode("latin-1"),
+        "headers": []
+    }, receive or request_received, send)
+
+    return messages[0]["status"], {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in messages[0]["headers"]
+    }, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+class TestAsyncStocksApp(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        with app.app_context():
+            cache.clear()
+
+        self.backend = StubScrapeBackend(latency=0.1, stocks_per_region=150)
+        installation = self.backend.installed()
+        installation.__enter__()
+        self.addCleanup(installation.__exit__, None, None, None)
+
+        self.asgi_app = AsyncStocksApp(app)
+
+    def scrapes_count(self):
+        return next(self.backend.scrapes_count)
+
+    async def test_cache_hit_served_without_executor(self):
+
+        with app.app_context():
+            recover_region_stocks("Argentina")
+
+        status, _, body = await request(
+            self.asgi_app, "/stocks", "region=Argentina")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(json.loads(body)), 150)
+        self.assertIsNone(self.asgi_app._AsyncStocksApp__scrape_executor)
+
+    async def test_concurrent_requests_share_one_scrape(self):
+
+        responses = await asyncio.gather(*[
+            request(self.asgi_app, "/stocks", "region=Brazil")
+            for _ in range(5)
+        ])
+
+        self.assertListEqual(
+            [status for status, _, _ in responses], [200] * 5)
+        self.assertEqual(self.scrapes_count(), 1)
+
+    async def test_rejects_scrapes_beyond_executor(self):
+
+        asgi_app = AsyncStocksApp(app, max_workers=2)
+        responses = await asyncio.gather(*[
+            request(asgi_app, "/stocks", f"region={region}")
+            for region in ("Chile", "Peru", "Uruguay", "Bolivia", "Ecuador")
+        ])
+
+        self.assertListEqual(
+            [status for status, _, _ in responses], [200, 200, 429, 429, 429])
+        for _, headers, _ in responses[2:]:
+            self.assertGreaterEqual(int(headers["retry-after"]), 1)
+        self.assertEqual(self.scrapes_count(), 2)
+
+    async def test_responses_match_flask_responses(self):
+
+        status, _, body = await request(self.asgi_app, "/stocks", "region=1")
+        self.assertEqual(status, 400)
+        self.assertIn("region_informed", json.loads(body))
+
+        for error in (
+            InexistentRegionError("Inexistent region informed: Chile"),
+            PartialScrapeError({"AAPL": {"price": 1.0}}, 100, 250),
+            ScrapeQueueFullError(12)
+        ):
+            with mock.patch.object(
+                    stocks, "recover_region_stocks", side_effect=error):
+                with app.app_context():
+                    expected_body, expected_status, expected_headers = \
+                        stocks.build_stocks_response("Chile")
+
+                status, headers, body = await request(
+                    self.asgi_app, "/stocks", "region=Chile")
+
+            self.assertEqual(status, expected_status)
+            self.assertDictEqual(json.loads(body), expected_body)
+            for name, value in expected_headers.items():
+                self.assertEqual(headers[name.lower()], value)
+
+    async def test_other_paths_served_by_flask(self):
+
+        status, headers, body = await request(self.asgi_app, "/stats")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "application/json")
+        self.assertIn("browsers", json.loads(body))
+
+    async def test_stream_unsubscribes_on_disconnection(self):
+
+        feed = mock.Mock()
+
+        def follow_region(flask_app, region_name, deliver):
+            deliver(("snapshot", {"AAPL": {"price": 1.0}}))
+            return feed
+
+        async def receive():
+            await asyncio.sleep(0.1)
+            return {"type": "http.disconnect"}
+
+        with mock.patch.object(asgi, "follow_region", follow_region):
+            status, headers, body = await request(
+                self.asgi_app, "/stocks/stream", "region=Peru", receive)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "text/event-stream")
+        self.assertTrue(body.startswith(b"event: snapshot\n"))
+        feed.unsubscribe.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
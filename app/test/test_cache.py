@@ -0,0 +1,103 @@
+import time
+import unittest
+
+from flask import Flask
+from flask_caching import Cache
+
+from app.main.model.cache import CacheNamespace, MemoryCacheTier, cache_tier
+
+
+class TestCacheNamespace(unittest.TestCase):
+
+    def test_evicts_least_recently_used_entries_over_budget(self):
+
+        namespace = CacheNamespace("regions", budget_bytes=3000)
+        for key in ("a", "b", "c"):
+            namespace.set(key, "x" * 900, 0)
+
+        namespace.get("a")
+        namespace.set("d", "x" * 900, 0)
+
+        self.assertIsNotNone(namespace.get("a"))
+        self.assertIsNone(namespace.get("b"))
+        self.assertLessEqual(namespace.resident_bytes, 3000)
+        self.assertEqual(namespace.stats()["evictions"], 1)
+
+    def test_cost_policy_evicts_large_entries_first(self):
+
+        namespace = CacheNamespace("regions", 4500, policy="cost")
+        namespace.set("united states", "x" * 3000, 0)
+        namespace.set("andorra", "x" * 100, 0)
+        namespace.set("argentina", "x" * 1500, 0)
+
+        self.assertIsNone(namespace.get("united states"))
+        self.assertIsNotNone(namespace.get("andorra"))
+        self.assertIsNotNone(namespace.get("argentina"))
+
+    def test_rejects_entries_larger_than_budget(self):
+
+        namespace = CacheNamespace("validation", 100)
+
+        self.assertFalse(namespace.set("big", "x" * 200, 0))
+        self.assertEqual(namespace.stats()["rejections"], 1)
+        self.assertEqual(namespace.resident_bytes, 0)
+
+    def test_expired_entries_are_misses(self):
+
+        namespace = CacheNamespace("checkpoints", 1000)
+        namespace.set("key", {"pages": {}}, 0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(namespace.get("key"))
+        stats = namespace.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 1))
+        self.assertEqual(stats["entries"], 0)
+
+
+class TestMemoryCacheTier(unittest.TestCase):
+
+    def test_namespaces_keep_separate_budgets_and_stats(self):
+
+        tier = MemoryCacheTier()
+        regions = tier.namespace("regions", 1000)
+        validation = tier.namespace("validation", 1000)
+
+        regions.set("brazil", "x" * 900, 0)
+        validation.set("brazil", (True, "Brazil", None), 0)
+        regions.set("chile", "x" * 900, 0)
+        validation.get("brazil")
+
+        stats = tier.stats()
+        self.assertEqual(stats["regions"]["evictions"], 1)
+        self.assertEqual(stats["validation"]["hits"], 1)
+        self.assertEqual(stats["validation"]["entries"], 1)
+        self.assertIs(tier.namespace("regions", 1000), regions)
+
+
+class TestBoundedMemoryCache(unittest.TestCase):
+
+    def test_memoized_calls_hit_rate(self):
+
+        app = Flask(__name__)
+        memoize_cache = Cache()
+        memoize_cache.init_app(app, config={
+            "CACHE_TYPE": "app.main.model.cache.BoundedMemoryCache",
+            "CACHE_NAMESPACE": "test_memoize"
+        })
+
+        @memoize_cache.memoize(60)
+        def validate(region_name):
+            return region_name.title()
+
+        with app.app_context():
+            for region_name in ("brazil", "chile", "peru", "brazil"):
+                validate(region_name)
+
+        stats = cache_tier.stats()["test_memoize"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+        self.assertEqual(stats["hit_rate"], 0.25)
+        self.assertEqual(stats["entries"], 4)  # Three values and the version
+
+
+if __name__ == '__main__':
+    unittest.main()
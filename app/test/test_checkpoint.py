@@ -0,0 +1,176 @@
+import unittest
+from unittest import mock
+from contextlib import contextmanager
+
+from cachelib import SimpleCache
+
+from manage import app
+from app.main.config import cache
+from app.main.model.checkpoint import ScrapeCheckpoint
+from app.main.service import stocks_service
+from app.main.controller.stocks import build_stocks_response
+from app.main.util.data_manipulation import screener_page_url
+
+SCREENER_URL = "https://finance.yahoo.com/screener/unsaved/1234?count=100"
+
+
+def mocked_scrapper(*result_metrics):
+    """
+    Scrapper whose results table goes through the informed metrics
+    """
+    scrapper = mock.Mock()
+    scrapper.read_current_url.return_value = SCREENER_URL
+    scrapper.read_element_text.side_effect = [
+        f"{first}-{last} of {total} results"
+        for first, last, total in result_metrics
+    ]
+    return scrapper
+
+
+def page_records(first, last):
+    return [
+        {"name": f"Company {index}", "symbol": f"C{index}", "price": index}
+        for index in range(first, last + 1)
+    ]
+
+
+@contextmanager
+def fake_session():
+    yield None
+
+
+class TestScrapeCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SimpleCache()
+
+    def test_resumes_from_first_missing_offset(self):
+
+        checkpoint = ScrapeCheckpoint.open("Argentina", store=self.store)
+        checkpoint.save_page(1, 100, 250, [{"symbol": "A"}])
+        checkpoint.save_page(101, 200, 250, [{"symbol": "B"}])
+
+        resumed = ScrapeCheckpoint.open("argentina", store=self.store)
+
+        self.assertEqual(resumed.session_id, checkpoint.session_id)
+        self.assertEqual(resumed.next_offset, 200)
+        self.assertTrue(resumed.has_page(101))
+        self.assertFalse(resumed.is_complete())
+        self.assertTupleEqual(resumed.coverage(), (200, 250))
+
+    def test_merges_pages_and_closes_session(self):
+
+        checkpoint = ScrapeCheckpoint.open("Andorra", store=self.store)
+        checkpoint.save_page(101, 150, 150, [{"symbol": "B"}])
+        checkpoint.save_page(1, 100, 150, [{"symbol": "A"}])
+
+        self.assertTrue(checkpoint.is_complete())
+        self.assertListEqual(
+            checkpoint.records(), [{"symbol": "A"}, {"symbol": "B"}])
+
+        checkpoint.close()
+        reopened = ScrapeCheckpoint.open("Andorra", store=self.store)
+
+        self.assertNotEqual(reopened.session_id, checkpoint.session_id)
+        self.assertDictEqual(reopened.pages, {})
+
+    def test_concurrent_scrapes_merge_their_pages(self):
+
+        first_scrape = ScrapeCheckpoint.open("Chile", store=self.store)
+        second_scrape = ScrapeCheckpoint.open("Chile", store=self.store)
+
+        first_scrape.save_page(1, 100, 300, [{"symbol": "A"}])
+        second_scrape.save_page(201, 300, 300, [{"symbol": "C"}])
+        first_scrape.save_page(101, 200, 300, [{"symbol": "B"}])
+
+        self.assertTrue(first_scrape.is_complete())
+        self.assertListEqual(
+            first_scrape.records(),
+            [{"symbol": "A"}, {"symbol": "B"}, {"symbol": "C"}])
+
+        resumed = ScrapeCheckpoint.open("Chile", store=self.store)
+        self.assertSetEqual(set(resumed.pages), {0, 100, 200})
+
+
+@mock.patch.object(
+    stocks_service, "recover_tabular_information",
+    lambda page_source: page_records(*page_source))
+class TestRecoverStocks(unittest.TestCase):
+
+    def setUp(self):
+        self.checkpoint = ScrapeCheckpoint("Argentina", "0", store=SimpleCache())
+
+    def test_resumes_from_checkpoint_offset(self):
+
+        self.checkpoint.save_page(1, 2, 5, page_records(1, 2))
+        scrapper = mocked_scrapper((3, 4, 5), (5, 5, 5))
+        scrapper.read_page_source.side_effect = [(3, 4), (5, 5)]
+
+        records = stocks_service.recover_stocks(scrapper, self.checkpoint)
+
+        scrapper.navigate_to.assert_called_once_with(
+            screener_page_url(SCREENER_URL, 2))
+        self.assertTrue(self.checkpoint.is_complete())
+        self.assertListEqual(
+            [record["symbol"] for record in records],
+            ["C1", "C2", "C3", "C4", "C5"])
+
+    def test_skips_checkpointed_pages(self):
+
+        self.checkpoint.save_page(3, 4, 5, page_records(3, 4))
+        scrapper = mocked_scrapper((1, 2, 5), (3, 4, 5), (5, 5, 5))
+        scrapper.read_page_source.side_effect = [(1, 2), (5, 5)]
+
+        records = stocks_service.recover_stocks(scrapper, self.checkpoint)
+
+        scrapper.navigate_to.assert_not_called()
+        self.assertEqual(scrapper.read_page_source.call_count, 2)
+        self.assertEqual(len(records), 5)
+
+
+@mock.patch.object(stocks_service.supervisor, "session", fake_session)
+class TestInterruptedScrape(unittest.TestCase):
+
+    region = "Argentina"
+
+    def tearDown(self):
+        with app.app_context():
+            cache.delete_memoized(
+                stocks_service.recover_region_stocks, self.region)
+            ScrapeCheckpoint.open(self.region).close()
+
+    def test_partial_results_then_resumed_scrape(self):
+
+        def interrupted_scrape(scrapper, region_name, checkpoint):
+            checkpoint.save_page(1, 2, 3, page_records(1, 2))
+            return checkpoint.records()
+
+        def resumed_scrape(scrapper, region_name, checkpoint):
+            self.assertEqual(checkpoint.next_offset, 2)
+            checkpoint.save_page(3, 3, 3, page_records(3, 3))
+            return checkpoint.records()
+
+        with app.app_context():
+            with mock.patch.object(
+                    stocks_service, "scrape_region_stocks", interrupted_scrape):
+                body, status, headers = build_stocks_response(self.region)
+
+            self.assertEqual(status, 206)
+            self.assertEqual(len(body), 2)
+            self.assertDictEqual(headers, {
+                "X-Stocks-Partial": "true", "X-Stocks-Coverage": "2/3"})
+
+            with mock.patch.object(
+                    stocks_service, "scrape_region_stocks", resumed_scrape):
+                body, status, headers = build_stocks_response(self.region)
+
+            self.assertEqual(status, 200)
+            self.assertEqual(len(body), 3)
+
+            # Completed scrape: its checkpoint is closed
+            reopened = ScrapeCheckpoint.open(self.region)
+            self.assertDictEqual(reopened.pages, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
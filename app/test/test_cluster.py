@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from manage import app
+from app.main.service import stocks_service
+from app.main.util.regions import regions_catalog
+from app.main.model.cluster import HashRing, ClusterRouter
+from app.main.util.exceptions import PartialScrapeError
+
+NODES = ["http://localhost:8001", "http://localhost:8002",
+         "http://localhost:8003"]
+
+
+class TestHashRing(unittest.TestCase):
+
+    def test_removing_a_node_only_moves_its_regions(self):
+
+        ring = HashRing(NODES)
+        reduced_ring = HashRing(NODES[:2])
+
+        owners = {region: ring.owner(region) for region in regions_catalog}
+        self.assertSetEqual(set(owners.values()), set(NODES))
+
+        for region, owner in owners.items():
+            if owner != NODES[2]:
+                self.assertEqual(reduced_ring.owner(region), owner)
+            self.assertEqual(
+                ring.owner(region, excluded={NODES[2]}),
+                reduced_ring.owner(region))
+
+
+class TestClusterRouter(unittest.TestCase):
+
+    def test_regions_owned_by_self_are_served_locally(self):
+
+        router = ClusterRouter(mock.Mock(), NODES, NODES[0])
+        owners = {region: router.owner(region) for region in regions_catalog}
+
+        self.assertIn(None, owners.values())
+        self.assertNotIn(NODES[0], owners.values())
+        self.assertIsNone(
+            ClusterRouter(mock.Mock(), [], "").owner("Argentina"))
+
+    def test_fails_over_when_owner_is_down(self):
+
+        down_node = "http://127.0.0.1:1"
+        router = ClusterRouter(mock.Mock(), [down_node, NODES[0]], NODES[0])
+        region = next(
+            region for region in regions_catalog
+            if router.owner(region) == down_node)
+
+        self.assertIsNone(router.forward(down_node, region))
+        self.assertIsNone(router.owner(region))
+        self.assertListEqual(router.stats()["down"], [down_node])
+
+
+@mock.patch.object(stocks_service, "refresh_region_stocks")
+@mock.patch.object(stocks_service, "recover_region_stocks")
+@mock.patch.object(stocks_service, "cluster")
+class TestClusterFeeds(unittest.TestCase):
+
+    snapshot = {"GGAL": {"symbol": "GGAL", "price": 1.5}}
+
+    def follow(self, region_name="Argentina"):
+        with mock.patch.object(stocks_service, "feed_hub") as feed_hub:
+            stocks_service.follow_region(app, region_name, mock.Mock())
+
+        _, _, load, refresh = feed_hub.subscribe.call_args[0]
+        return load, refresh
+
+    def test_snapshots_taken_from_owner(self, cluster, recover, refresh):
+
+        cluster.owner.return_value = NODES[1]
+        cluster.forward.return_value = (self.snapshot, 200, {})
+
+        load_feed, refresh_feed = self.follow()
+
+        self.assertDictEqual(load_feed(), self.snapshot)
+        self.assertDictEqual(refresh_feed(), self.snapshot)
+        cluster.forward.assert_called_with(NODES[1], "Argentina")
+        recover.assert_not_called()
+        refresh.assert_not_called()
+
+        cluster.forward.return_value = (self.snapshot, 206, {
+            "X-Stocks-Partial": "true", "X-Stocks-Coverage": "1/3"})
+        with self.assertRaises(PartialScrapeError):
+            refresh_feed()
+
+    def test_local_scrape_on_owner_failover(self, cluster, recover, refresh):
+
+        cluster.owner.return_value = NODES[1]
+        cluster.forward.return_value = None
+        refresh.return_value = self.snapshot
+
+        _, refresh_feed = self.follow()
+
+        self.assertDictEqual(refresh_feed(), self.snapshot)
+        refresh.assert_called_once_with("Argentina")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
 import unittest
 
-from app.main.util.data_manipulation import format_stock
+import numpy as np
+import pandas as pd
+
+from app.main.util.data_manipulation import (
+    format_stock, normalize_stocks, diff_snapshots, screener_page_url
+)
 
 
 class TestInformationManipulation(unittest.TestCase):
@@ -24,6 +29,74 @@ class TestInformationManipulation(unittest.TestCase):
             target_stock
         )
 
+    def test_stocks_normalization(self):
+
+        original_stocks = pd.DataFrame({
+            "name": ["Test", None, "Duplicated", "Empty", "Nameless"],
+            "symbol": ["TST.SYMB", "THS.SYMB", "TST.SYMB", "EMP.SYMB", np.nan],
+            "price": [1234.3, "1,234.567", 10.0, np.nan, "12.3k"]
+        })
+
+        target_stocks = {
+            "TST.SYMB": {"symbol": "TST.SYMB", "name": "Test", "price": "1234.30"},
+            "THS.SYMB": {"symbol": "THS.SYMB", "name": "", "price": "1234.57"},
+            "EMP.SYMB": {"symbol": "EMP.SYMB", "name": "Empty", "price": None}
+        }
+
+        self.assertDictEqual(normalize_stocks(original_stocks), target_stocks)
+
+    def test_suffixed_prices_normalization(self):
+
+        original_stocks = pd.DataFrame({
+            "name": ["Kilo", "Mega", "Invalid"],
+            "symbol": ["K", "M", "I"],
+            "price": ["12.3k", "2.5M", "N/A"]
+        })
+
+        self.assertListEqual(
+            [stock["price"] for stock in normalize_stocks(original_stocks).values()],
+            ["12300.00", "2500000.00", None]
+        )
+
+    def test_snapshots_diff(self):
+
+        previous_snapshot = {
+            "KPT": {"symbol": "KPT", "name": "Kept", "price": "1.00"},
+            "CHG": {"symbol": "CHG", "name": "Changed", "price": "10.00"},
+            "RMV": {"symbol": "RMV", "name": "Removed", "price": "3.00"}
+        }
+        current_snapshot = {
+            "KPT": {"symbol": "KPT", "name": "Kept", "price": "1.00"},
+            "CHG": {"symbol": "CHG", "name": "Changed", "price": "12.50"},
+            "ADD": {"symbol": "ADD", "name": "Added", "price": None}
+        }
+
+        self.assertDictEqual(
+            diff_snapshots(previous_snapshot, current_snapshot),
+            {
+                "added": {
+                    "ADD": {"symbol": "ADD", "name": "Added", "price": None}
+                },
+                "removed": ["RMV"],
+                "changed": {
+                    "CHG": {
+                        "symbol": "CHG", "name": "Changed", "price": "12.50",
+                        "previous_price": "10.00", "delta": "2.50"
+                    }
+                }
+            }
+        )
+
+    def test_screener_page_url(self):
+
+        self.assertEqual(
+            screener_page_url(
+                "https://finance.yahoo.com/screener/unsaved/abc?count=25",
+                200
+            ),
+            "https://finance.yahoo.com/screener/unsaved/abc?count=100&offset=200"
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
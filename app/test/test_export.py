@@ -0,0 +1,110 @@
+import json
+import time
+import unittest
+import importlib.util
+import tempfile
+from pathlib import Path
+from unittest import mock
+from contextlib import contextmanager
+
+from manage import app
+from app.main.service import export_service
+from app.main.model.admission import AdmissionController
+
+
+@contextmanager
+def fake_session():
+    yield None
+
+
+def fake_scrape(scrapper, region_name, checkpoint):
+    checkpoint.save_page(1, 2, 3, [
+        {"name": "First", "symbol": "FST", "price": "1,234.5"},
+        {"name": "Second", "symbol": "SND", "price": 2}
+    ])
+    checkpoint.save_page(3, 3, 3, [
+        {"name": "First", "symbol": "FST", "price": 1234.5}
+    ])
+    return checkpoint.records()
+
+
+@mock.patch.object(export_service, "scrape_region_stocks", fake_scrape)
+@mock.patch.object(export_service.supervisor, "session", fake_session)
+class TestRegionsExport(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = Path(tempfile.mkdtemp())
+
+    def test_ndjson_export(self):
+
+        summary = export_service.export_regions(
+            app, ["Argentina", "United Kingdom"], self.output_dir)
+
+        self.assertListEqual(sorted(summary["exported"]), [
+            "Argentina", "United Kingdom"])
+        self.assertEqual(summary["rows"], 4)
+
+        with open(self.output_dir / "united_kingdom.ndjson") as exported:
+            self.assertListEqual([json.loads(line) for line in exported], [
+                {"region": "United Kingdom", "symbol": "FST",
+                 "name": "First", "price": "1234.50"},
+                {"region": "United Kingdom", "symbol": "SND",
+                 "name": "Second", "price": "2.00"}
+            ])
+
+    def test_fresh_export_is_skipped(self):
+
+        export_service.export_regions(
+            app, ["Argentina"], self.output_dir, file_format="csv")
+        summary = export_service.export_regions(
+            app, ["Argentina"], self.output_dir,
+            file_format="csv", max_age=60)
+
+        self.assertListEqual(summary["skipped"], ["Argentina"])
+        self.assertEqual(
+            (self.output_dir / "argentina.csv").read_text().splitlines()[0],
+            "region,symbol,name,price"
+        )
+
+    def test_exports_wait_for_admission_without_deadline(self):
+
+        def slow_scrape(scrapper, region_name, checkpoint):
+            time.sleep(0.1)
+            return fake_scrape(scrapper, region_name, checkpoint)
+
+        admission = AdmissionController(
+            mock.Mock(), max_concurrent=1, queue_size=4, max_wait=0.01)
+
+        with mock.patch.object(export_service, "admission", admission), \
+                mock.patch.object(
+                    export_service, "scrape_region_stocks", slow_scrape):
+            summary = export_service.export_regions(
+                app, ["Argentina", "Brazil", "Chile"], self.output_dir,
+                workers=3)
+
+        self.assertListEqual(
+            sorted(summary["exported"]), ["Argentina", "Brazil", "Chile"])
+        self.assertEqual(admission.stats()["rejected"], 0)
+
+    @unittest.skipUnless(
+        importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_parquet_export(self):
+        import pyarrow.parquet as pq
+
+        summary = export_service.export_regions(
+            app, ["Argentina"], self.output_dir, file_format="parquet")
+
+        self.assertListEqual(summary["exported"], ["Argentina"])
+
+        exported = pq.read_table(str(self.output_dir / "argentina.parquet"))
+        self.assertEqual(exported.num_rows, 2)
+        self.assertDictEqual(exported.to_pydict(), {
+            "region": ["Argentina", "Argentina"],
+            "symbol": ["FST", "SND"],
+            "name": ["First", "Second"],
+            "price": ["1234.50", "2.00"]
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
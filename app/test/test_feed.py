@@ -0,0 +1,91 @@
+import threading
+import unittest
+from queue import Queue
+from unittest import mock
+
+from manage import app
+from app.main.config import logger
+from app.main.controller import stream
+from app.main.model.feed import FeedHub, format_event
+
+
+class TestFeedHub(unittest.TestCase):
+
+    def setUp(self):
+        self.hub = FeedHub(logger, interval=0.05)
+        self.snapshots = [
+            {"A": {"symbol": "A", "name": "A", "price": "1.00"}},
+            {"A": {"symbol": "A", "name": "A", "price": "1.50"}}
+        ]
+        self.refreshes = 0
+
+    def load(self):
+        return self.snapshots[0]
+
+    def refresh(self):
+        self.refreshes += 1
+        return self.snapshots[1]
+
+    def test_single_refresh_fans_out_to_subscribers(self):
+
+        first_subscriber, second_subscriber = Queue(), Queue()
+        feed = self.hub.subscribe(
+            "Argentina", first_subscriber.put, self.load, self.refresh)
+        same_feed = self.hub.subscribe(
+            "argentina", second_subscriber.put, self.load, self.refresh)
+
+        self.assertIs(feed, same_feed)
+        self.assertTrue(self.hub.is_followed("ARGENTINA"))
+        self.assertFalse(self.hub.is_followed("Brazil"))
+
+        deltas = list()
+        for subscriber in (first_subscriber, second_subscriber):
+            self.assertEqual(
+                subscriber.get(timeout=1), ("snapshot", self.snapshots[0]))
+
+            event, changes = subscriber.get(timeout=1)
+            self.assertEqual(event, "delta")
+            self.assertEqual(changes["changed"]["A"]["delta"], "0.50")
+            deltas.append(changes)
+
+        feed.unsubscribe(first_subscriber.put)
+        feed.unsubscribe(second_subscriber.put)
+
+        # Both subscribers were served by the very same refresh
+        self.assertIs(deltas[0], deltas[1])
+        self.assertGreaterEqual(self.refreshes, 1)
+
+    def test_event_format(self):
+
+        self.assertEqual(
+            format_event("delta", {"removed": ["A"]}),
+            'event: delta\ndata: {"removed": ["A"]}\n\n'
+        )
+
+
+class TestStocksStreamController(unittest.TestCase):
+
+    @mock.patch.object(stream.Config, "FEED_HEARTBEAT_INTERVAL", 0.01)
+    @mock.patch.object(stream, "streams", threading.BoundedSemaphore(1))
+    @mock.patch.object(stream, "follow_region")
+    def test_limits_open_streams(self, follow_region):
+
+        client = app.test_client()
+
+        first_stream = client.get("/stocks/stream?region=Argentina")
+        self.assertEqual(first_stream.status_code, 200)
+
+        rejected = client.get("/stocks/stream?region=Brazil")
+        self.assertEqual(rejected.status_code, 503)
+        self.assertIn("Retry-After", rejected.headers)
+
+        first_stream.close()
+        follow_region.return_value.unsubscribe.assert_called_once()
+
+        second_stream = client.get("/stocks/stream?region=Brazil")
+        self.assertEqual(second_stream.status_code, 200)
+        second_stream.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import unittest
+from argparse import Namespace
+from contextlib import redirect_stdout
+
+from app.benchmark.load_test import percentile, summarize, run
+
+
+class TestLoadTestReport(unittest.TestCase):
+
+    def test_nearest_rank_percentile(self):
+
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summary_of_samples(self):
+
+        samples = [
+            ("hit", 0.001, 200), ("hit", 0.003, 200),
+            ("miss", 0.2, 200), ("miss", 0.4, 429)
+        ]
+
+        summary = summarize(samples, elapsed=2)
+
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["throughput_rps"], 2)
+        self.assertEqual(summary["p50_ms"], 3)
+        self.assertEqual(summary["max_ms"], 400)
+        self.assertDictEqual(summary["statuses"], {"200": 3, "429": 1})
+
+        self.assertEqual(summarize([], elapsed=1)["requests"], 0)
+        self.assertIsNone(summarize([], elapsed=1)["p99_ms"])
+
+
+class TestLoadTestRun(unittest.TestCase):
+
+    def test_inprocess_run(self):
+
+        with redirect_stdout(io.StringIO()):
+            results = run(Namespace(
+                mode="inprocess", requests=20, concurrency=4, regions=[],
+                hit_ratio=0.5, scrape_latency=0.0, stocks_per_region=10,
+                seed=0, output=None
+            ))
+
+        self.assertEqual(results["overall"]["requests"], 20)
+        self.assertDictEqual(results["overall"]["statuses"], {"200": 20})
+        self.assertEqual(
+            results["cache_hit"]["requests"]
+            + results["cache_miss"]["requests"], 20)
+
+        # Observed misses are scrapped (pre-warmed regions at most once)
+        self.assertGreater(results["cache_miss"]["requests"], 0)
+        self.assertGreaterEqual(
+            results["scrapes"], results["cache_miss"]["requests"])
+        self.assertLessEqual(
+            results["scrapes"], 5 + results["cache_miss"]["requests"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import pstats
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from flask import Flask
+
+from app.main.model.profiler import RequestProfiler
+
+
+def create_profiled_app(profiler):
+    app = Flask(__name__)
+
+    @app.route("/stocks")
+    def stocks():
+        return {"AAPL": sum(range(1000))}
+
+    profiler.install(app, lambda: ("United States", "miss"))
+    return app
+
+
+class TestRequestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+
+    def test_disabled_profiler_installs_no_hooks(self):
+
+        app = create_profiled_app(
+            RequestProfiler(self.output_dir.name, mock.Mock()))
+
+        self.assertFalse(any(app.before_request_funcs.values()))
+        self.assertFalse(any(app.after_request_funcs.values()))
+
+    def test_admin_token_writes_tagged_profile(self):
+
+        app = create_profiled_app(RequestProfiler(
+            self.output_dir.name, mock.Mock(), admin_token="secret"))
+        client = app.test_client()
+
+        self.assertNotIn("X-Profile", client.get("/stocks").headers)
+        self.assertNotIn(
+            "X-Profile", client.get("/stocks?profile=wrong").headers)
+
+        response = client.get("/stocks?profile=%C3%A9")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile", response.headers)
+
+        response = client.get(
+            "/stocks", headers={"X-Profile-Token": "secret"})
+        profile_path = Path(self.output_dir.name, response.headers["X-Profile"])
+
+        self.assertTrue(profile_path.name.endswith("_united_states_miss.prof"))
+        self.assertGreater(pstats.Stats(str(profile_path)).total_calls, 0)
+
+    def test_samples_one_in_n_requests(self):
+
+        app = create_profiled_app(RequestProfiler(
+            self.output_dir.name, mock.Mock(), sample_rate=3))
+        client = app.test_client()
+
+        profiled = [
+            "X-Profile" in client.get("/stocks").headers for _ in range(6)]
+
+        self.assertListEqual(profiled, [True, False, False] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
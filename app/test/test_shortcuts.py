@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cachelib import SimpleCache
+
+from app.main.model.checkpoint import ScrapeCheckpoint
+from app.main.model.shortcuts import ScreenerShortcuts
+from app.main.service import stocks_service
+
+SCREENER_URL = "https://finance.yahoo.com/screener/unsaved/1234?count=100"
+
+
+class TestScreenerShortcuts(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.file_path = Path(self.directory.name, "shortcuts.json")
+
+    def test_shortcuts_are_persisted_between_instances(self):
+
+        ScreenerShortcuts(self.file_path, mock.Mock()).record(
+            "Argentina", SCREENER_URL)
+
+        shortcuts = ScreenerShortcuts(self.file_path, mock.Mock())
+        self.assertEqual(shortcuts.get("argentina"), SCREENER_URL)
+
+        shortcuts.forget("ARGENTINA")
+        self.assertIsNone(
+            ScreenerShortcuts(self.file_path, mock.Mock()).get("Argentina"))
+
+    def test_broken_shortcut_falls_back_to_filter_clicks(self):
+
+        shortcuts = ScreenerShortcuts(self.file_path, mock.Mock())
+        shortcuts.record("Argentina", "https://finance.yahoo.com/broken")
+
+        scrapper = mock.Mock()
+        scrapper.wait_element.side_effect = [Exception("Not found"), None]
+        scrapper.read_current_url.return_value = SCREENER_URL
+
+        def recover_stocks(scrapper, checkpoint):
+            checkpoint.save_page(1, 1, 1, [{"symbol": "GGAL"}])
+            return checkpoint.records()
+
+        checkpoint = ScrapeCheckpoint("Argentina", "0", store=SimpleCache())
+        with mock.patch.multiple(
+                stocks_service,
+                screener_shortcuts=shortcuts,
+                remove_original_filtering_buttons=mock.DEFAULT,
+                open_region_filter=mock.DEFAULT,
+                select_informed_region=mock.DEFAULT,
+                expand_stocks_table=mock.DEFAULT,
+                recover_stocks=recover_stocks) as clicks:
+            stocks_service.scrape_region_stocks(
+                scrapper, "Argentina", checkpoint)
+
+        clicks["select_informed_region"].assert_called_once()
+        self.assertEqual(shortcuts.get("Argentina"), SCREENER_URL)
+
+
+if __name__ == '__main__':
+    unittest.main()
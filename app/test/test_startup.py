@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+import subprocess
+
+STARTUP_SNIPPET = """
+import sys
+from app.main import create_app, HEAVY_MODULES
+create_app()
+print(",".join(name for name in HEAVY_MODULES if name in sys.modules))
+"""
+
+
+class TestLazyStartup(unittest.TestCase):
+
+    def test_heavy_modules_not_loaded_on_startup(self):
+
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET],
+            check=True, capture_output=True, text=True
+        )
+
+        self.assertEqual(completed.stdout.strip(), "")
+
+    def test_unwritable_log_file_fails_on_startup(self):
+
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET],
+            capture_output=True, text=True,
+            env=dict(os.environ, API_LOGGER_RECORD_LOG="True",
+                     API_LOGGER_FILE_PATH="/inexistent/folder/api.log")
+        )
+
+        self.assertNotEqual(completed.returncode, 0)
+        self.assertIn("LogFileCreationError", completed.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
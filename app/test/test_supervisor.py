@@ -0,0 +1,79 @@
+import unittest
+import subprocess
+
+import psutil
+
+from app.main.config import logger
+from app.main.model.supervisor import BrowserSupervisor
+
+
+class FakeScrapper:
+    """
+    Spawns a process tree resembling chromedriver and its chrome children.
+    Quitting only finalizes the root, leaving the children behind
+    """
+
+    def __init__(self):
+        self.navigation_count = 0
+        self.process = subprocess.Popen(["sh", "-c", "sleep 60 & sleep 60"])
+
+    def browser_pid(self):
+        return self.process.pid
+
+    def exit_navigation(self):
+        self.process.kill()
+        self.process.wait()
+
+
+def is_gone(process):
+    try:
+        return process.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+class TestBrowserSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.supervisor = BrowserSupervisor(
+            logger, FakeScrapper, max_navigations=2, max_idle=1)
+
+    def tearDown(self):
+        self.supervisor.shutdown()
+
+    def test_reuses_idle_browser(self):
+
+        with self.supervisor.session() as scrapper:
+            scrapper.navigation_count += 1
+
+        with self.supervisor.session() as reused_scrapper:
+            self.assertIs(reused_scrapper, scrapper)
+
+        self.assertEqual(self.supervisor.stats()["live_browsers"], 1)
+
+    def test_recycles_browser_and_kills_orphans(self):
+
+        with self.supervisor.session() as scrapper:
+            scrapper.navigation_count += 2
+            children = psutil.Process(scrapper.browser_pid()).children()
+
+        self.assertTrue(children)
+        self.assertTrue(all(is_gone(child) for child in children))
+
+        stats = self.supervisor.stats()
+        self.assertEqual(stats["live_browsers"], 0)
+        self.assertEqual(stats["recycled_browsers"], 1)
+        self.assertEqual(stats["killed_orphans"], len(children))
+
+    def test_discards_browser_on_failure(self):
+
+        with self.assertRaises(RuntimeError):
+            with self.supervisor.session() as scrapper:
+                raise RuntimeError("Scrape failed")
+
+        self.assertTrue(scrapper.process.poll() is not None)
+        self.assertEqual(self.supervisor.stats()["live_browsers"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
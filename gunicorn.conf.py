@@ -0,0 +1,30 @@
+""" Gunicorn configuration """
+import gc
+
+from decouple import config
+
+bind = f"{config('HOST', default='0.0.0.0')}:{config('PORT', default='8000')}"
+timeout = 1000
+
+# Threaded workers: each '/stocks/stream' client holds one thread (not a
+# whole worker), and workers keep reporting to the arbiter while streaming.
+# Overridden by '-k uvicorn.workers.UvicornWorker' (asynchronous mode)
+worker_class = "gthread"
+workers = config("GUNICORN_WORKERS", default=2, cast=int)
+threads = config("GUNICORN_THREADS", default=16, cast=int)
+
+# The application is created once, on the master process, and shared
+# (copy-on-write) by every forked worker
+preload_app = True
+
+
+def when_ready(server):
+    if config("PRELOAD_HEAVY_MODULES", default=False, cast=bool):
+        from app.main import preload_heavy_modules
+
+        server.log.info("Preloading heavy modules")
+        preload_heavy_modules()
+
+    # Preloaded objects are moved out of the garbage collector tracking,
+    # so collections on workers do not touch (and copy) shared pages
+    gc.freeze()
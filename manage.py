@@ -1,8 +1,11 @@
-import sys
+import json
+import argparse
 import unittest
+from pathlib import Path
 from decouple import config
 
 from app.main import create_app
+from app.main.config import Config
 
 app = create_app()
 
@@ -11,6 +14,18 @@ def run():
     app.run(host=config('HOST'), port=config("PORT"))
 
 
+def run_async():
+    """
+    Asynchronous (ASGI) server execution
+    """
+    import uvicorn
+
+    from app.main.asgi import AsyncStocksApp
+
+    uvicorn.run(
+        AsyncStocksApp(app), host=config('HOST'), port=config("PORT", cast=int))
+
+
 def test():
     """
     Unitary tests execution
@@ -22,8 +37,65 @@ def test():
     return 1
 
 
+def export(arguments):
+    """
+    Bulk regions stocks export
+    """
+    from app.main.util.regions import regions_catalog
+    from app.main.service.export_service import export_regions
+
+    summary = export_regions(
+        app,
+        regions_catalog if arguments.all else arguments.regions,
+        Path(arguments.output),
+        file_format=arguments.format,
+        workers=arguments.workers,
+        max_age=arguments.max_age
+    )
+    print(json.dumps(summary, indent=4))
+
+    return 0 if not summary["failed"] else 1
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Yahoo stocks API manager")
+    parser.add_argument(
+        "command", nargs="?", default="run",
+        choices=["run", "async", "test", "export"])
+
+    export_arguments = parser.add_argument_group("export")
+    regions = export_arguments.add_mutually_exclusive_group()
+    regions.add_argument(
+        "--regions", nargs="+", default=[], help="Regions to be exported")
+    regions.add_argument(
+        "--all", action="store_true", help="Export the whole regions catalog")
+    export_arguments.add_argument(
+        "--workers", type=int, default=Config.SCRAPPER_MAX_WORKERS,
+        help="Regions scrapped in parallel")
+    export_arguments.add_argument(
+        "--format", default="ndjson", choices=["ndjson", "csv", "parquet"])
+    export_arguments.add_argument(
+        "--output", default="./export", help="Output folder")
+    export_arguments.add_argument(
+        "--max-age", type=int, default=Config.CACHE_TIMEOUT,
+        help="Seconds during which an exported region is kept (not scrapped)")
+
+    arguments = parser.parse_args()
+    if arguments.command == "export" and not (
+            arguments.regions or arguments.all):
+        parser.error("export requires --regions or --all")
+
+    return arguments
+
+
 if __name__ == '__main__':
-    if 'test' in sys.argv:
+    arguments = parse_arguments()
+
+    if arguments.command == 'test':
         test()
+    elif arguments.command == 'async':
+        run_async()
+    elif arguments.command == 'export':
+        raise SystemExit(export(arguments))
     else:
         run()